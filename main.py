@@ -4,6 +4,8 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import os
 import glob
+from scripts.tickers import add_market
+from scripts import run_registry
 
 # ====================== CONFIG ======================
 RESULTS_FOLDER = "results"
@@ -48,8 +50,24 @@ st.markdown('<div class="main-title">📊 Deep Learning–Based Value-at-Risk Da
 st.markdown('<div class="sub-text">Interactive visualization of model performance, risk coverage, and VaR calibration</div>', unsafe_allow_html=True)
 
 # ====================== LOAD DATA ======================
+LATEST_RUN = "Latest (results/)"
+
+
+# Short TTL so runs recorded while the dashboard is open show up in the picker
+@st.cache_data(ttl=15)
+def list_runs():
+    if not os.path.exists(run_registry.REGISTRY_DB):
+        return []
+    with run_registry.connect() as conn:
+        runs = run_registry.list_runs(conn, limit=100)
+    return [f"{r.run_id} {r.name or ''}".strip() for r in runs.itertuples()]
+
+
 @st.cache_data
-def load_summary():
+def load_summary(run_id=None):
+    if run_id is not None:
+        with run_registry.connect() as conn:
+            return run_registry.run_summary(conn, run_id)
     path = os.path.join(RESULTS_FOLDER, "var_summary.csv")
     if not os.path.exists(path):
         st.error("❌ var_summary.csv not found. Please run var_backtest.py first.")
@@ -57,14 +75,25 @@ def load_summary():
     df = pd.read_csv(path)
     return df
 
-df = load_summary()
+
+def run_plot(run_id, stock, model):
+    if run_id is None:
+        return sorted(glob.glob(os.path.join(RESULTS_FOLDER, f"{stock}_{model}_VaR_plot.png")))
+    with run_registry.connect() as conn:
+        path = run_registry.artifact_path(conn, run_id, stock, model, "plot")
+    return [path] if path and os.path.exists(path) else []
+
+
+# Runs recorded in the registry (python -m scripts.cli runs record)
+selected_run = st.sidebar.selectbox("Select Run", options=[LATEST_RUN, *list_runs()])
+run_id = None if selected_run == LATEST_RUN else selected_run.split(" ", 1)[0]
+
+df = load_summary(run_id)
 if df is None:
     st.stop()
 
-# Add Market column for grouping
-india = ["Reliance", "Infosys"]
-us = ["Apple", "Tesla"]
-df["Market"] = df["Stock"].apply(lambda x: "India" if x in india else "US")
+# Add Market column for grouping (from data/tickers.csv)
+df = add_market(df)
 
 stocks = df["Stock"].unique()
 models = df["Model"].unique()
@@ -110,7 +139,7 @@ with tab1:
 
     # Load and display plots (your generated PNGs)
     st.subheader("Prediction and VaR Visualizations")
-    plot_files = sorted(glob.glob(os.path.join(RESULTS_FOLDER, f"{selected_stock}_{selected_model}_VaR_plot.png")))
+    plot_files = run_plot(run_id, selected_stock, selected_model)
     if plot_files:
         for img_path in plot_files:
             st.image(img_path, caption=os.path.basename(img_path), use_container_width=True)
@@ -152,7 +181,7 @@ with tab2:
     
             if (kupiec_data["Kupiec_p95"].fillna(0) == 0).all():
                 st.warning("All Kupiec p-values are zero — using small reference values for visualization only.")
-                kupiec_data["Kupiec_p95"] = [0.005, 0.008]  
+                kupiec_data["Kupiec_p95"] = [0.005 + 0.003 * i for i in range(len(kupiec_data))]
 
                 fig, ax = plt.subplots(figsize=(5,3))
                 sns.barplot(data=kupiec_data, x="Market", y="Kupiec_p95", palette="Greens", ax=ax)
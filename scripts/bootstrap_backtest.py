@@ -0,0 +1,222 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+import numpy as np
+import pandas as pd
+from scipy.special import chdtrc
+
+RESULTS_FOLDER = "results"
+CI_FILE = os.path.join(RESULTS_FOLDER, "var_bootstrap_ci.csv")
+PAIRWISE_FILE = os.path.join(RESULTS_FOLDER, "var_bootstrap_pairwise.csv")
+
+# Per-replicate statistics, in the column order returned by replicate_stats()
+STATS = ["ViolRate95", "ViolRate99", "ES95", "ES99", "Kupiec_LR95", "Kupiec_LR99"]
+
+
+# --- 1️⃣ Index matrices: each row is one bootstrap replicate of 0..n-1 ---
+def stationary_indices(rng, replicates, n, block_length):
+    # Politis–Romano: a new block starts at each step with probability 1/block_length
+    new_block = rng.random((replicates, n)) < 1.0 / block_length
+    new_block[:, 0] = True
+    starts = rng.integers(0, n, size=(replicates, n))
+    steps = np.arange(n)
+    block_start = np.maximum.accumulate(np.where(new_block, steps, 0), axis=1)
+    first = np.take_along_axis(starts, block_start, axis=1)
+    return (first + steps - block_start) % n
+
+
+def moving_block_indices(rng, replicates, n, block_length):
+    n_blocks = -(-n // block_length)
+    starts = rng.integers(0, n - block_length + 1, size=(replicates, n_blocks))
+    idx = starts[:, :, None] + np.arange(block_length)
+    return idx.reshape(replicates, -1)[:, :n]
+
+
+INDEX_METHODS = {
+    "stationary": stationary_indices,
+    "block": moving_block_indices,
+}
+
+
+# --- 2️⃣ Vectorized backtest statistics over a batch of replicates ---
+def kupiec_lr(violations, alpha, n):
+    # Log form of var_backtest.kupiec_test, safe from under/overflow for large n. p_hat is
+    # clipped, so 0 or n breaches give a large LR (p ≈ 0) just like kupiec_test's p = 0.
+    p_hat = np.clip(violations / n, 0.0001, 0.9999)
+    return -2 * ((n - violations) * (np.log(1 - alpha) - np.log(1 - p_hat)) +
+                 violations * (np.log(alpha) - np.log(p_hat)))
+
+
+def expected_shortfall(Y, breach):
+    count = breach.sum(axis=1)
+    total = np.where(breach, Y, 0.0).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def replicate_stats(y, preds, idx):
+    """Backtest statistics for every replicate row of ``idx``.
+
+    ``y`` is ``(n,)`` and ``preds`` is ``(models, n)``; returns an array of
+    shape ``(models, replicates, len(STATS))``.
+    """
+    n = idx.shape[1]
+    Y = y[idx]
+    out = np.empty((preds.shape[0], idx.shape[0], len(STATS)))
+    for m, p in enumerate(preds):
+        P = p[idx]
+        VaR95, VaR99 = np.percentile(P, [5, 1], axis=1)
+        breach95 = Y < VaR95[:, None]
+        breach99 = Y < VaR99[:, None]
+        v95, v99 = breach95.sum(axis=1), breach99.sum(axis=1)
+        out[m, :, 0] = v95 / n
+        out[m, :, 1] = v99 / n
+        out[m, :, 2] = expected_shortfall(Y, breach95)
+        out[m, :, 3] = expected_shortfall(Y, breach99)
+        out[m, :, 4] = kupiec_lr(v95, 0.05, n)
+        out[m, :, 5] = kupiec_lr(v99, 0.01, n)
+    return out
+
+
+def _run_chunk(task):
+    y, preds, seed, replicates, method, block_length = task
+    rng = np.random.default_rng(seed)
+    idx = INDEX_METHODS[method](rng, replicates, len(y), block_length)
+    return replicate_stats(y, preds, idx)
+
+
+# --- 3️⃣ Loading: group every model of a stock on a shared test series ---
+def load_predictions(results_folder=RESULTS_FOLDER):
+    grouped = {}
+    for file in sorted(os.listdir(results_folder)):
+        if not file.endswith("_preds.npz"):
+            continue
+        stock, model = file.replace("_preds.npz", "").split("_", 1)
+        data = np.load(os.path.join(results_folder, file))
+        grouped.setdefault(stock, {})[model] = (data["y_test"].flatten(), data["preds"].flatten())
+
+    stocks = {}
+    for stock, models in grouped.items():
+        y = next(iter(models.values()))[0]
+        aligned = {m: p for m, (yt, p) in models.items() if len(yt) == len(y) and np.allclose(yt, y)}
+        for m in set(models) - set(aligned):
+            print(f"⚠️ {stock}-{m}: test series differs from the other models — skipped.")
+        stocks[stock] = (y, list(aligned), np.vstack(list(aligned.values())))
+    return stocks
+
+
+def bootstrap(stocks, replicates, method, block_length, chunk_size, workers, seed):
+    """Run all replicates for every stock; returns ``{stock: (models, replicates, stats)}``."""
+    specs = [
+        (stock, min(chunk_size, replicates - start))
+        for stock in stocks for start in range(0, replicates, chunk_size)
+    ]
+    seeds = np.random.SeedSequence(seed).spawn(len(specs))
+    tasks = [
+        (stocks[stock][0], stocks[stock][2], child, size, method, block_length)
+        for (stock, size), child in zip(specs, seeds)
+    ]
+    owners = [stock for stock, _ in specs]
+
+    chunks = {stock: [] for stock in stocks}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for stock, result in zip(owners, pool.map(_run_chunk, tasks)):
+            chunks[stock].append(result)
+    return {stock: np.concatenate(parts, axis=1) for stock, parts in chunks.items()}
+
+
+# --- 4️⃣ Summaries: per-model confidence intervals and paired model comparisons ---
+def point_estimates(y, preds):
+    return replicate_stats(y, preds, np.arange(len(y))[None])[:, 0]
+
+
+def confidence_intervals(stocks, draws, level):
+    lo_q, hi_q = 100 * (1 - level) / 2, 100 * (1 + level) / 2
+    rows = []
+    for stock, (y, models, preds) in stocks.items():
+        point = point_estimates(y, preds)
+        lower, upper = np.nanpercentile(draws[stock], [lo_q, hi_q], axis=1)
+        stderr = np.nanstd(draws[stock], axis=1)
+        for m, model in enumerate(models):
+            for s, stat in enumerate(STATS):
+                rows.append({
+                    "Stock": stock, "Model": model, "Metric": stat,
+                    "Estimate": point[m, s], "Lower": lower[m, s], "Upper": upper[m, s],
+                    "StdErr": stderr[m, s],
+                })
+            # Kupiec p-value is monotone in LR, so its interval maps from the LR interval
+            for stat in ("Kupiec_LR95", "Kupiec_LR99"):
+                s = STATS.index(stat)
+                rows.append({
+                    "Stock": stock, "Model": model, "Metric": stat.replace("LR", "p"),
+                    "Estimate": chdtrc(1, point[m, s]),
+                    "Lower": chdtrc(1, upper[m, s]), "Upper": chdtrc(1, lower[m, s]),
+                    "StdErr": np.nan,
+                })
+    return pd.DataFrame(rows)
+
+
+def pairwise_tests(stocks, draws, level):
+    """Paired tests on coverage error |ViolRate - alpha| using shared replicate indices."""
+    lo_q, hi_q = 100 * (1 - level) / 2, 100 * (1 + level) / 2
+    rows = []
+    for stock, (y, models, preds) in stocks.items():
+        point = point_estimates(y, preds)
+        for metric, col, alpha in (("CoverageError95", 0, 0.05), ("CoverageError99", 1, 0.01)):
+            err = np.abs(draws[stock][:, :, col] - alpha)
+            err_point = np.abs(point[:, col] - alpha)
+            for a, b in combinations(range(len(models)), 2):
+                diff = err[a] - err[b]
+                p_value = min(1.0, 2 * min((diff <= 0).mean(), (diff >= 0).mean()))
+                rows.append({
+                    "Stock": stock, "ModelA": models[a], "ModelB": models[b], "Metric": metric,
+                    "Diff": err_point[a] - err_point[b],
+                    "Lower": np.percentile(diff, lo_q), "Upper": np.percentile(diff, hi_q),
+                    "p_value": p_value,
+                    "Better": models[a] if err_point[a] < err_point[b] else models[b],
+                })
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Block-bootstrap confidence intervals for VaR backtests.")
+    parser.add_argument("--replicates", type=int, default=10000)
+    parser.add_argument("--method", choices=list(INDEX_METHODS), default="stationary")
+    parser.add_argument("--block-length", type=int, default=10, help="(mean) block length in days")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="replicates per worker task")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--level", type=float, default=0.95)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    stocks = load_predictions()
+    if not stocks:
+        print("❌ No *_preds.npz files in results/. Run train_models first.")
+        return 1
+    shortest = min(len(y) for y, _, _ in stocks.values())
+    if not 1 <= args.block_length <= shortest:
+        print(f"❌ --block-length must be between 1 and the shortest test series ({shortest} days).")
+        return 1
+
+    start = time.perf_counter()
+    draws = bootstrap(stocks, args.replicates, args.method, args.block_length,
+                      args.chunk_size, args.workers, args.seed)
+    elapsed = time.perf_counter() - start
+
+    ci = confidence_intervals(stocks, draws, args.level)
+    pairs = pairwise_tests(stocks, draws, args.level)
+    ci.to_csv(CI_FILE, index=False)
+    pairs.to_csv(PAIRWISE_FILE, index=False)
+
+    n_pairs = sum(len(models) for _, models, _ in stocks.values())
+    print(f"✅ {args.replicates:,} {args.method} replicates × {n_pairs} stock/model pairs in {elapsed:.2f}s")
+    print(f"✅ Confidence intervals saved to {CI_FILE}")
+    print(f"✅ Pairwise comparisons saved to {PAIRWISE_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
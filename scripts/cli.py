@@ -0,0 +1,145 @@
+"""Single entry point for the VaR pipeline.
+
+Usage (from the repository root):
+
+    python -m scripts.cli <command> [options...]
+
+Only the module behind the chosen command is imported, so lightweight
+commands such as ``backtest`` or ``report`` never pay for TensorFlow,
+matplotlib or seaborn. Anything after the command name is forwarded to
+the underlying script as its own ``sys.argv``.
+"""
+import argparse
+import importlib
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# command -> (module, help). Modules expose a ``main()`` and are imported lazily.
+COMMANDS = {
+    "fetch": ("scripts.fetch_data", "Download OHLCV data and log returns"),
+    "preprocess": ("scripts.preprocess_data", "Build scaled 30-day input windows"),
+    "train": ("scripts.train_models", "Train MLP/CNN1D/LSTM/Transformer per stock"),
+    "train-bench": ("scripts.training_perf", "Compare default vs fast CPU training per architecture"),
+    "train-distributed": ("scripts.distributed_train", "Multi-worker data-parallel pooled training"),
+    "cv": ("scripts.cross_validate", "Purged/walk-forward cross-validation across processes"),
+    "distill": ("scripts.distill", "Distill LSTM/Transformer into small student models"),
+    "ensemble": ("scripts.ensemble", "Fuse all architectures into one multi-output model"),
+    "export": ("scripts.export_models", "Export XLA/TFLite CPU artifacts with parity check"),
+    "backtest": ("scripts.var_backtest", "Compute VaR and Kupiec backtests"),
+    "bootstrap": ("scripts.bootstrap_backtest", "Block-bootstrap CIs and pairwise model tests"),
+    "stress": ("scripts.stress_test", "Batched historical/hypothetical stress scenarios"),
+    "plot": ("scripts.visualize_results", "Render VaR and violation-rate charts"),
+    "report": ("scripts.generate_analysis_report", "Write Markdown/DOCX report"),
+    "runs": ("scripts.run_registry", "Record, list, query and diff experiment runs"),
+}
+
+# Commands whose wall time is not logged as a pipeline stage for the run registry
+UNTIMED = {"runs"}
+
+# Cold-start budget (seconds) for commands that run on every cron tick / dashboard reload.
+STARTUP_BUDGET = {
+    "backtest": 1.5,
+    "report": 1.5,
+}
+
+
+def load_command(name):
+    module_name, _ = COMMANDS[name]
+    return importlib.import_module(module_name).main
+
+
+def serve(argv):
+    """Launch the Streamlit dashboard in a child process."""
+    cmd = [sys.executable, "-m", "streamlit", "run", "main.py", *argv]
+    return subprocess.call(cmd, cwd=ROOT)
+
+
+def measure_startup(name, repeat=3):
+    """Best-of-``repeat`` wall time for a fresh interpreter to load ``name``."""
+    code = f"from scripts.cli import load_command; load_command({name!r})"
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                              capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+        if proc.returncode != 0:
+            return None, proc.stderr.strip().splitlines()[-1] if proc.stderr else "failed"
+        timings.append(elapsed)
+    return min(timings), None
+
+
+def startup(argv):
+    """Measure cold-start time per command and enforce ``STARTUP_BUDGET``."""
+    parser = argparse.ArgumentParser(prog="cli startup", description=startup.__doc__)
+    parser.add_argument("commands", nargs="*", default=list(COMMANDS))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    over_budget = []
+    print(f"{'Command':<12}{'Startup (s)':>12}{'Budget (s)':>12}")
+    for name in args.commands:
+        elapsed, error = measure_startup(name, args.repeat)
+        budget = STARTUP_BUDGET.get(name)
+        budget_txt = f"{budget:.2f}" if budget is not None else "-"
+        if elapsed is None:
+            print(f"{name:<12}{'error':>12}{budget_txt:>12}  ⚠️ {error}")
+            if budget is not None:
+                over_budget.append(name)
+            continue
+        flag = ""
+        if budget is not None and elapsed > budget:
+            over_budget.append(name)
+            flag = "  ❌ over budget"
+        print(f"{name:<12}{elapsed:>12.3f}{budget_txt:>12}{flag}")
+
+    if over_budget:
+        print(f"\n❌ Startup budget exceeded: {', '.join(over_budget)}")
+        return 1
+    print("\n✅ All commands within startup budget.")
+    return 0
+
+
+# Commands implemented here rather than in a pipeline script.
+BUILTINS = {
+    "serve": (serve, "Launch the Streamlit dashboard"),
+    "startup": (startup, "Measure cold-start time per command"),
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = argparse.ArgumentParser(
+        prog="python -m scripts.cli",
+        description="Deep learning VaR pipeline",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="\n".join(
+            f"  {name:<12}{help_txt}"
+            for name, (_, help_txt) in {**COMMANDS, **BUILTINS}.items()
+        ),
+    )
+    parser.add_argument("command", choices=[*COMMANDS, *BUILTINS], metavar="command")
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+
+    if args.command in BUILTINS:
+        return BUILTINS[args.command][0](args.args)
+
+    # Pipeline scripts resolve data/ and results/ relative to the repository root.
+    os.chdir(ROOT)
+    module_name, _ = COMMANDS[args.command]
+    sys.argv = [module_name, *args.args]
+    start = time.perf_counter()
+    status = load_command(args.command)()
+    if args.command not in UNTIMED and not status:
+        from scripts.run_registry import log_stage
+        log_stage(args.command, time.perf_counter() - start, args.args)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
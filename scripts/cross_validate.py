@@ -0,0 +1,207 @@
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from scripts.preprocess_data import OUTPUT_FOLDER, WINDOW_SIZE
+from scripts.var_backtest import var_metrics
+
+RESULTS_FOLDER = "results"
+CACHE_FOLDER = os.path.join(RESULTS_FOLDER, "cv_cache")
+CV_FOLDS_FILE = os.path.join(RESULTS_FOLDER, "cv_folds.csv")
+CV_SUMMARY_FILE = os.path.join(RESULTS_FOLDER, "cv_summary.csv")
+
+SCHEMES = ["purged", "expanding"]
+
+
+# --- 1️⃣ Fold construction over target indices 0..n-1 ---
+def make_folds(n, k, scheme, purge=WINDOW_SIZE, embargo=0.01):
+    """Return ``[(train_idx, test_idx), ...]`` for ``n`` windowed samples.
+
+    ``purged``: k contiguous test blocks; training samples within ``purge``
+    steps of a block (overlapping input windows) are dropped on both sides,
+    plus an ``embargo`` fraction of samples after it.
+    ``expanding``: walk-forward — the series is cut into k+1 blocks and each
+    of the last k is tested on everything before it, less the purge gap.
+    """
+    embargo_n = int(embargo * n)
+    if scheme == "purged":
+        bounds = np.linspace(0, n, k + 1, dtype=int)
+    else:
+        bounds = np.linspace(0, n, k + 2, dtype=int)[1:]
+
+    folds = []
+    idx = np.arange(n)
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        test = idx[start:end]
+        if scheme == "purged":
+            keep = (idx < start - purge) | (idx >= end + purge + embargo_n)
+        else:
+            keep = idx < start - purge
+        folds.append((idx[keep], test))
+    return folds
+
+
+def load_returns(stock):
+    data = np.load(os.path.join(OUTPUT_FOLDER, f"{stock}_seq.npz"))
+    if "returns" not in data:
+        raise KeyError(f"{stock}_seq.npz has no raw returns — re-run preprocess_data.py.")
+    return data["returns"]
+
+
+def fold_arrays(returns, train_idx, test_idx):
+    # Per-fold scaler: statistics from the training targets only
+    windows = sliding_window_view(returns, WINDOW_SIZE + 1)
+    mean, std = returns[train_idx + WINDOW_SIZE].mean(), returns[train_idx + WINDOW_SIZE].std()
+    scaled = ((windows - mean) / std)[..., np.newaxis].astype(np.float32)
+    X, y = scaled[:, :-1], scaled[:, -1]
+    return X[train_idx], y[train_idx], X[test_idx], y[test_idx]
+
+
+# --- 2️⃣ Fold cache: one JSON per finished fold, keyed on the run configuration ---
+def dataset_fingerprint(stock):
+    # Content hash, so a fetch/preprocess refresh invalidates that stock's cached folds
+    h = hashlib.sha1()
+    with open(os.path.join(OUTPUT_FOLDER, f"{stock}_seq.npz"), "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def config_key(config, stock):
+    keyed = {**config, "data": dataset_fingerprint(stock)}
+    return hashlib.sha1(json.dumps(keyed, sort_keys=True).encode()).hexdigest()[:10]
+
+
+def cache_path(stock, model_name, fold, key):
+    return os.path.join(CACHE_FOLDER, f"{stock}_{model_name}_fold{fold}_{key}.json")
+
+
+def _init_worker(threads):
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def _run_fold(task):
+    from scripts.train_models import MODEL_BUILDERS, EPOCHS, BATCH_SIZE
+    from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
+
+    stock, model_name, fold, config, key = task
+    returns = load_returns(stock)
+    n = len(returns) - WINDOW_SIZE
+    train_idx, test_idx = make_folds(n, config["k"], config["scheme"], embargo=config["embargo"])[fold]
+    X_train, y_train, X_test, y_test = fold_arrays(returns, train_idx, test_idx)
+
+    model = MODEL_BUILDERS[model_name]((X_train.shape[1], X_train.shape[2]))
+    model.fit(
+        X_train, y_train,
+        epochs=config.get("epochs") or EPOCHS,
+        batch_size=BATCH_SIZE,
+        validation_split=0.1,
+        callbacks=[
+            EarlyStopping(monitor='val_loss', patience=6, restore_best_weights=True),
+            ReduceLROnPlateau(monitor='val_loss', factor=0.5, patience=3)
+        ],
+        verbose=0
+    )
+    preds = model.predict(X_test, verbose=0)
+
+    row = {
+        "Stock": stock,
+        "Model": model_name,
+        "Fold": fold,
+        "TrainSize": len(train_idx),
+        "TestStart": int(test_idx[0]),
+        "TestEnd": int(test_idx[-1]),
+        "MSE": float(np.mean((y_test.flatten() - preds.flatten()) ** 2)),
+        **{k: float(v) for k, v in var_metrics(y_test, preds).items()},
+    }
+    path = cache_path(stock, model_name, fold, key)
+    with open(path + ".tmp", "w") as fh:
+        json.dump(row, fh)
+    os.replace(path + ".tmp", path)
+    return row
+
+
+def summarise(folds):
+    folds = folds.assign(
+        CoverageError95=(folds["ViolRate95"] - 0.05).abs(),
+        CoverageError99=(folds["ViolRate99"] - 0.01).abs(),
+    )
+    metrics = ["MSE", "ViolRate95", "ViolRate99", "CoverageError95", "CoverageError99", "Kupiec_p95"]
+    summary = folds.groupby(["Stock", "Model"])[metrics].agg(["mean", "std"])
+    summary.columns = [f"{m}_{stat}" for m, stat in summary.columns]
+    summary["Folds"] = folds.groupby(["Stock", "Model"]).size()
+    return summary.reset_index().sort_values(["Stock", "CoverageError95_mean"])
+
+
+def main():
+    from scripts.train_models import MODEL_BUILDERS, STUDENT_MODELS, list_stocks
+
+    teachers = [m for m in MODEL_BUILDERS if m not in STUDENT_MODELS]
+    parser = argparse.ArgumentParser(description="Purged / walk-forward cross-validation in parallel.")
+    parser.add_argument("--scheme", choices=SCHEMES, default="purged")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--embargo", type=float, default=0.01, help="fraction of samples after each test block")
+    parser.add_argument("--epochs", type=int, help="override train_models.EPOCHS")
+    parser.add_argument("--models", nargs="*", default=teachers, choices=list(MODEL_BUILDERS))
+    parser.add_argument("--stocks", nargs="*", help="default: every processed dataset")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 1) // 2))
+    args = parser.parse_args()
+
+    os.makedirs(CACHE_FOLDER, exist_ok=True)
+    stocks = args.stocks or list_stocks()
+    config = {"scheme": args.scheme, "k": args.folds, "embargo": args.embargo,
+              "epochs": args.epochs, "window": WINDOW_SIZE}
+
+    rows, tasks = [], []
+    for stock in stocks:
+        key = config_key(config, stock)
+        for model_name in args.models:
+            for fold in range(args.folds):
+                path = cache_path(stock, model_name, fold, key)
+                if os.path.exists(path):
+                    with open(path) as fh:
+                        rows.append(json.load(fh))
+                else:
+                    tasks.append((stock, model_name, fold, config, key))
+    print(f"🔁 {len(rows)} folds cached, {len(tasks)} to run on {args.workers} workers")
+
+    threads = max(1, (os.cpu_count() or 1) // args.workers)
+    # spawn, not fork: TensorFlow's runtime is not fork-safe
+    with ProcessPoolExecutor(max_workers=args.workers,
+                             mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(threads,)) as pool:
+        futures = {pool.submit(_run_fold, task): task for task in tasks}
+        for future in as_completed(futures):
+            stock, model_name, fold, _, _ = futures[future]
+            try:
+                rows.append(future.result())
+            except Exception as exc:
+                print(f"⚠️ {stock}-{model_name} fold {fold} failed: {exc}")
+                continue
+            print(f"✅ {stock}-{model_name} fold {fold} done")
+
+    if not rows:
+        print("❌ No folds completed.")
+        return 1
+    folds = pd.DataFrame(rows).sort_values(["Stock", "Model", "Fold"])
+    summary = summarise(folds)
+    folds.to_csv(CV_FOLDS_FILE, index=False)
+    summary.to_csv(CV_SUMMARY_FILE, index=False)
+
+    print(f"\n✅ Fold results saved to {CV_FOLDS_FILE}")
+    print(f"✅ CV summary saved to {CV_SUMMARY_FILE}")
+    print(summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
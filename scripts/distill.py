@@ -0,0 +1,109 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+
+from scripts.export_models import benchmark
+from scripts.train_models import (
+    MODELS_FOLDER, RESULTS_FOLDER, MODEL_BUILDERS, STUDENT_MODELS,
+    EPOCHS, BATCH_SIZE, callbacks, list_stocks, load_dataset
+)
+from scripts.var_backtest import var_metrics
+
+DISTILL_SUMMARY = os.path.join(RESULTS_FOLDER, "distill_summary.csv")
+TEACHERS = ["LSTM", "Transformer"]
+
+
+def distill_targets(teacher, X_train, y_train, alpha):
+    # Blend the teacher's soft predictions with the ground truth (alpha=1 → pure teacher)
+    soft = teacher.predict(X_train, batch_size=1024, verbose=0).reshape(y_train.shape)
+    return alpha * soft + (1 - alpha) * y_train
+
+
+def distill_stock(stock_name, teacher_name, students, alpha):
+    teacher_path = f"{MODELS_FOLDER}/{stock_name}_{teacher_name}.keras"
+    if not os.path.exists(teacher_path):
+        print(f"⚠️ Missing teacher {teacher_path} — run train_models.py first.")
+        return []
+
+    X_train, X_test, y_train, y_test = load_dataset(f"{stock_name}_seq.npz")
+    X_test = X_test.astype(np.float32)
+    input_shape = (X_train.shape[1], X_train.shape[2])
+    teacher = tf.keras.models.load_model(teacher_path)
+    targets = distill_targets(teacher, X_train, y_train, alpha)
+
+    teacher_latency, teacher_throughput = benchmark(lambda x: teacher(x, training=False).numpy(), X_test)
+    teacher_metrics = var_metrics(y_test, teacher.predict(X_test, verbose=0))
+
+    rows = []
+    for student_name in students:
+        print(f"\n🎓 Distilling {teacher_name} → {student_name} for {stock_name}...")
+        student = MODEL_BUILDERS[student_name](input_shape)
+        student.fit(
+            X_train, targets,
+            epochs=EPOCHS,
+            batch_size=BATCH_SIZE,
+            validation_split=0.1,
+            callbacks=callbacks,
+            verbose=1
+        )
+
+        preds = student.predict(X_test, verbose=0)
+        mse = float(np.mean((y_test.flatten() - preds.flatten()) ** 2))
+
+        # Save results under the student's registry name
+        student.save(f"{MODELS_FOLDER}/{stock_name}_{student_name}.keras")
+        np.savez_compressed(f"{RESULTS_FOLDER}/{stock_name}_{student_name}_preds.npz",
+                            y_test=y_test, preds=preds)
+        with open(f"{RESULTS_FOLDER}/{stock_name}_{student_name}_mse.txt", "w") as f:
+            f.write(f"MSE: {mse}\n")
+
+        latency, throughput = benchmark(lambda x: student(x, training=False).numpy(), X_test)
+        metrics = var_metrics(y_test, preds)
+        rows.append({
+            "Stock": stock_name,
+            "Teacher": teacher_name,
+            "Student": student_name,
+            "Alpha": alpha,
+            "Teacher_Latency_ms": teacher_latency,
+            "Student_Latency_ms": latency,
+            "Speedup": teacher_latency / latency,
+            "ThroughputSpeedup": throughput / teacher_throughput,
+            "Teacher_ViolRate95": teacher_metrics["ViolRate95"],
+            "Student_ViolRate95": metrics["ViolRate95"],
+            "dViolRate95": metrics["ViolRate95"] - teacher_metrics["ViolRate95"],
+            "dViolRate99": metrics["ViolRate99"] - teacher_metrics["ViolRate99"],
+            "Teacher_Kupiec_p95": teacher_metrics["Kupiec_p95"],
+            "Student_Kupiec_p95": metrics["Kupiec_p95"],
+            "Teacher_Kupiec_p99": teacher_metrics["Kupiec_p99"],
+            "Student_Kupiec_p99": metrics["Kupiec_p99"],
+        })
+        print(f"✅ {student_name} done. {teacher_latency / latency:.1f}x faster per window, "
+              f"ΔViolRate95={rows[-1]['dViolRate95']:+.4f}")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distill a heavy teacher into low-latency students.")
+    parser.add_argument("--teacher", choices=TEACHERS, default="Transformer")
+    parser.add_argument("--students", nargs="*", default=sorted(STUDENT_MODELS), choices=sorted(STUDENT_MODELS))
+    parser.add_argument("--alpha", type=float, default=1.0,
+                        help="weight on teacher predictions vs ground truth in the target")
+    parser.add_argument("--stocks", nargs="*", help="default: every processed dataset")
+    args = parser.parse_args()
+
+    stocks = args.stocks or list_stocks()
+
+    rows = []
+    for stock_name in stocks:
+        rows.extend(distill_stock(stock_name, args.teacher, args.students, args.alpha))
+
+    df = pd.DataFrame(rows)
+    df.to_csv(DISTILL_SUMMARY, index=False)
+    print(f"\n✅ Distillation summary saved to {DISTILL_SUMMARY}")
+    print(df)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Data-parallel multi-worker training of one pooled model.
+
+Each worker runs this script with its own ``TF_CONFIG``; TensorFlow's
+``MultiWorkerMirroredStrategy`` keeps the replicas in sync. On a single box,
+``--launch N`` starts N local CPU workers and restarts the whole cluster if
+one dies, resuming from the last ``BackupAndRestore`` checkpoint:
+
+    python -m scripts.distributed_train --launch 4 --model LSTM
+
+Across hosts, export ``TF_CONFIG`` on every machine and run without
+``--launch``.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+
+MODELS_FOLDER = "models"
+RESULTS_FOLDER = "results"
+CHECKPOINT_FOLDER = os.path.join(MODELS_FOLDER, "distributed")
+BASE_PORT = 23456
+
+
+# --- 1️⃣ Local launcher: one process per worker, whole-cluster restart on failure ---
+def tf_config(n_workers, index, port):
+    return json.dumps({
+        "cluster": {"worker": [f"localhost:{port + i}" for i in range(n_workers)]},
+        "task": {"type": "worker", "index": index},
+    })
+
+
+def launch(n_workers, argv, port, max_restarts):
+    for attempt in range(max_restarts + 1):
+        procs = []
+        for i in range(n_workers):
+            env = dict(os.environ, TF_CONFIG=tf_config(n_workers, i, port))
+            cmd = [sys.executable, "-m", "scripts.distributed_train", *argv]
+            procs.append(subprocess.Popen(cmd, env=env))
+
+        failed = False
+        while any(p.poll() is None for p in procs):
+            if any(p.returncode not in (None, 0) for p in procs):
+                failed = True
+                break
+            time.sleep(1)
+        failed = failed or any(p.returncode != 0 for p in procs)
+
+        if not failed:
+            print(f"\n🎯 {n_workers}-worker training finished.")
+            return 0
+        for p in procs:
+            if p.poll() is None:
+                p.terminate()
+        for p in procs:
+            p.wait()
+        print(f"⚠️ A worker failed (attempt {attempt + 1}/{max_restarts + 1}) — restarting from last backup.")
+    return 1
+
+
+# --- 2️⃣ Worker ---
+def pooled_dataset(stocks, load_dataset):
+    # Training windows of every stock stacked; last 10% of each stock held out for validation
+    train_X, train_y, val_X, val_y, tests = [], [], [], [], {}
+    for stock in stocks:
+        X_train, X_test, y_train, y_test = load_dataset(f"{stock}_seq.npz")
+        cut = int(0.9 * len(X_train))
+        train_X.append(X_train[:cut])
+        train_y.append(y_train[:cut])
+        val_X.append(X_train[cut:])
+        val_y.append(y_train[cut:])
+        tests[stock] = (X_test, y_test)
+    return (np.concatenate(train_X), np.concatenate(train_y),
+            np.concatenate(val_X), np.concatenate(val_y), tests)
+
+
+def train_worker(args):
+    import tensorflow as tf
+    if args.threads:
+        tf.config.threading.set_intra_op_parallelism_threads(args.threads)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+
+    # The strategy must exist before any other TF op runs
+    strategy = tf.distribute.MultiWorkerMirroredStrategy()
+    from scripts.train_models import MODEL_BUILDERS, EPOCHS, BATCH_SIZE, list_stocks, load_dataset
+
+    config = json.loads(os.environ.get("TF_CONFIG", "{}"))
+    task = config.get("task", {"type": "worker", "index": 0})
+    is_chief = task.get("type") == "chief" or (
+        task.get("index", 0) == 0 and "chief" not in config.get("cluster", {}))
+    workers = strategy.num_replicas_in_sync
+    global_batch = (args.batch_size or BATCH_SIZE) * workers
+
+    stocks = args.stocks or list_stocks()
+    X_train, y_train, X_val, y_val, tests = pooled_dataset(stocks, load_dataset)
+
+    options = tf.data.Options()
+    options.experimental_distribute.auto_shard_policy = tf.data.experimental.AutoShardPolicy.DATA
+    train_ds = (tf.data.Dataset.from_tensor_slices((X_train.astype("float32"), y_train.astype("float32")))
+                .shuffle(10000, seed=42).batch(global_batch).with_options(options))
+    val_ds = (tf.data.Dataset.from_tensor_slices((X_val.astype("float32"), y_val.astype("float32")))
+              .batch(global_batch).with_options(options))
+
+    with strategy.scope():
+        model = MODEL_BUILDERS[args.model]((X_train.shape[1], X_train.shape[2]))
+        if args.scale_lr:
+            lr = model.optimizer.learning_rate
+            lr.assign(lr * workers)
+
+    backup_dir = os.path.join(CHECKPOINT_FOLDER, f"Pooled{args.model}", "backup")
+    print(f"🚀 Worker {task.get('index', 0)}/{workers}: {len(X_train):,} windows, global batch {global_batch}")
+    model.fit(
+        train_ds,
+        epochs=args.epochs or EPOCHS,
+        validation_data=val_ds,
+        callbacks=[
+            # Restores weights, optimizer state and epoch after a cluster restart
+            tf.keras.callbacks.BackupAndRestore(backup_dir),
+            tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=6, restore_best_weights=True),
+            tf.keras.callbacks.ReduceLROnPlateau(monitor='val_loss', factor=0.5, patience=3),
+        ],
+        verbose=1 if is_chief else 0
+    )
+
+    # Every worker must take part in saving; only the chief keeps its copy
+    name = f"Pooled{args.model}"
+    save_path = f"{MODELS_FOLDER}/{name}.keras" if is_chief else os.path.join(
+        tempfile.mkdtemp(), f"{name}.keras")
+    model.save(save_path)
+    if not is_chief:
+        shutil.rmtree(os.path.dirname(save_path), ignore_errors=True)
+        return
+
+    # The other workers have exited, so predicting under the strategy would hang on
+    # its collectives; score with a plain copy of the saved model instead.
+    scorer = tf.keras.models.load_model(save_path)
+    for stock, (X_test, y_test) in tests.items():
+        preds = scorer.predict(X_test, verbose=0)
+        mse = float(np.mean((y_test.flatten() - preds.flatten()) ** 2))
+        np.savez_compressed(f"{RESULTS_FOLDER}/{stock}_{name}_preds.npz", y_test=y_test, preds=preds)
+        with open(f"{RESULTS_FOLDER}/{stock}_{name}_mse.txt", "w") as f:
+            f.write(f"MSE: {mse}\n")
+        print(f"✅ {stock} {name} MSE = {mse:.6f}")
+
+
+def worker_argv(args):
+    argv = ["--model", args.model]
+    if args.stocks:
+        argv += ["--stocks", *args.stocks]
+    for flag, value in (("--epochs", args.epochs), ("--batch-size", args.batch_size)):
+        if value is not None:
+            argv += [flag, str(value)]
+    if args.scale_lr:
+        argv.append("--scale-lr")
+    # Split the box's cores between local workers unless told otherwise
+    threads = args.threads or max(1, (os.cpu_count() or 1) // args.launch)
+    return argv + ["--threads", str(threads)]
+
+
+def main():
+    # Importing the registry does not start the TF runtime, so the strategy can still be created later
+    from scripts.train_models import MODEL_BUILDERS, STUDENT_MODELS
+
+    parser = argparse.ArgumentParser(description="Multi-worker data-parallel training of a pooled model.")
+    parser.add_argument("--model", default="LSTM",
+                        choices=[m for m in MODEL_BUILDERS if m not in STUDENT_MODELS])
+    parser.add_argument("--stocks", nargs="*", help="stocks pooled into one dataset (default: all)")
+    parser.add_argument("--epochs", type=int, help="override train_models.EPOCHS")
+    parser.add_argument("--batch-size", type=int, help="per-worker batch (default train_models.BATCH_SIZE)")
+    parser.add_argument("--scale-lr", action="store_true", help="scale learning rate linearly with workers")
+    parser.add_argument("--threads", type=int, help="intra-op threads per worker")
+    parser.add_argument("--launch", type=int, metavar="N", help="start N local workers")
+    parser.add_argument("--port", type=int, default=BASE_PORT)
+    parser.add_argument("--max-restarts", type=int, default=3)
+    args = parser.parse_args()
+
+    os.makedirs(MODELS_FOLDER, exist_ok=True)
+    os.makedirs(RESULTS_FOLDER, exist_ok=True)
+
+    if args.launch:
+        return launch(args.launch, worker_argv(args), args.port, args.max_restarts)
+
+    train_worker(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
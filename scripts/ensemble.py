@@ -0,0 +1,111 @@
+import argparse
+import os
+import time
+import numpy as np
+import tensorflow as tf
+
+from scripts.models import build_ensemble
+from scripts.train_models import (
+    MODELS_FOLDER, RESULTS_FOLDER, MODEL_BUILDERS, STUDENT_MODELS,
+    EPOCHS, BATCH_SIZE, list_stocks, load_dataset
+)
+from scripts.var_backtest import var_metrics
+
+COMBINE_METHODS = ["mean", "coverage", "learned"]
+VALIDATION_SPLIT = 0.1   # tail of the training windows used to weight members
+TIMING_REPEATS = 5       # timed predict calls per path after one warm-up call
+
+
+def coverage_weights(member_preds, y_val):
+    # Weight each member by inverse VaR95 coverage error on the validation tail
+    errors = np.array([
+        abs(var_metrics(y_val, preds)["ViolRate95"] - 0.05) for preds in member_preds.values()
+    ])
+    inv = 1.0 / (errors + 1e-3)
+    return inv / inv.sum()
+
+
+def time_predict(predict, repeats=TIMING_REPEATS):
+    # The warm-up call pays for tracing the predict function, so both paths are timed warm
+    predict()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+def build_for_stock(stock_name, combine):
+    members = {}
+    for model_name in MODEL_BUILDERS:
+        if model_name in STUDENT_MODELS:
+            continue
+        path = f"{MODELS_FOLDER}/{stock_name}_{model_name}.keras"
+        if not os.path.exists(path):
+            print(f"⚠️ Missing trained model {path} — skipping.")
+            continue
+        members[model_name] = tf.keras.models.load_model(path)
+    if not members:
+        return None
+
+    X_train, X_test, y_train, y_test = load_dataset(f"{stock_name}_seq.npz")
+    input_shape = (X_train.shape[1], X_train.shape[2])
+    ensemble = build_ensemble(members, input_shape, learn_weights=(combine == "learned"))
+
+    val_idx = int((1 - VALIDATION_SPLIT) * len(X_train))
+    if combine == "coverage":
+        fused = ensemble.predict(X_train[val_idx:], batch_size=1024, verbose=0)
+        weights = coverage_weights({k: fused[k] for k in members}, y_train[val_idx:])
+        ensemble.get_layer("Ensemble").set_weights([weights.reshape(-1, 1).astype("float32")])
+    elif combine == "learned":
+        ensemble.fit(
+            X_train, {"Ensemble": y_train},
+            epochs=EPOCHS,
+            batch_size=BATCH_SIZE,
+            validation_split=VALIDATION_SPLIT,
+            callbacks=[tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=6,
+                                                        restore_best_weights=True)],
+            verbose=1
+        )
+
+    weights = ensemble.get_layer("Ensemble").get_weights()[0].flatten()
+    print("   Weights: " + ", ".join(f"{k}={w:.3f}" for k, w in zip(members, weights)))
+    return ensemble, members, X_test, y_test
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuse trained architectures into one ensemble graph.")
+    parser.add_argument("--combine", choices=COMBINE_METHODS, default="coverage")
+    parser.add_argument("--stocks", nargs="*", help="default: every processed dataset")
+    args = parser.parse_args()
+
+    stocks = args.stocks or list_stocks()
+
+    for stock_name in stocks:
+        print(f"\n🧩 Building {args.combine} ensemble for {stock_name}...")
+        built = build_for_stock(stock_name, args.combine)
+        if built is None:
+            continue
+        ensemble, members, X_test, y_test = built
+
+        # Separate predict calls per architecture vs one fused forward pass (median of warm calls)
+        separate = time_predict(lambda: [member.predict(X_test, verbose=0) for member in members.values()])
+        single = time_predict(lambda: ensemble.predict(X_test, verbose=0))
+        fused = ensemble.predict(X_test, verbose=0)
+
+        ensemble.save(f"{MODELS_FOLDER}/{stock_name}_Ensemble.keras")
+        np.savez_compressed(f"{RESULTS_FOLDER}/{stock_name}_Ensemble_preds.npz",
+                            y_test=y_test, preds=fused["Ensemble"])
+        mse = float(np.mean((y_test.flatten() - fused["Ensemble"].flatten()) ** 2))
+        with open(f"{RESULTS_FOLDER}/{stock_name}_Ensemble_mse.txt", "w") as f:
+            f.write(f"MSE: {mse}\n")
+
+        print(f"✅ Ensemble done. MSE = {mse:.6f} | "
+              f"{len(members)} predict calls: {separate:.3f}s, fused: {single:.3f}s")
+
+    print("\n🎯 Ensemble predictions saved!")
+
+
+if __name__ == "__main__":
+    main()
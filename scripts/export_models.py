@@ -0,0 +1,204 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+
+from scripts.train_models import MODELS_FOLDER, RESULTS_FOLDER, MODEL_BUILDERS, list_stocks, load_dataset
+from scripts.var_backtest import var_metrics
+
+EXPORT_FOLDER = os.path.join(MODELS_FOLDER, "exported")
+EXPORT_SUMMARY = os.path.join(RESULTS_FOLDER, "export_summary.csv")
+
+FORMATS = ["keras", "xla", "tflite_dynamic", "tflite_int8"]
+
+CALIBRATION_SAMPLES = 500   # training windows fed to the int8 representative dataset
+BENCH_BATCH = 256           # batch size for the throughput benchmark
+LATENCY_RUNS = 200          # single-window calls timed for the latency benchmark
+PARITY_TOLERANCE = 0.005    # max allowed |Δ violation rate| vs the float Keras model
+
+
+# --- 1️⃣ XLA: jit-compiled concrete function saved as a SavedModel ---
+def export_xla(model, input_shape, path):
+    serve = tf.function(
+        lambda x: model(x, training=False),
+        jit_compile=True,
+        input_signature=[tf.TensorSpec([None, *input_shape], tf.float32)],
+    )
+    module = tf.Module()
+    module.model = model
+    module.serve = serve
+    tf.saved_model.save(module, path, signatures={"serving_default": serve.get_concrete_function()})
+    return path
+
+
+def xla_predictor(path):
+    # Keep the loaded module alive: its variables are freed with it
+    loaded = tf.saved_model.load(path)
+    return lambda x: loaded.serve(tf.constant(x, tf.float32)).numpy()
+
+
+# --- 2️⃣ TFLite: dynamic-range or int8 post-training quantization ---
+def export_tflite(model, path, quantization, calibration=None):
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    # BiLSTM / MultiHeadAttention may need TF ops the builtin kernels lack
+    converter.target_spec.supported_ops = [
+        tf.lite.OpsSet.TFLITE_BUILTINS,
+        tf.lite.OpsSet.SELECT_TF_OPS,
+    ]
+    if quantization == "int8":
+        def representative_dataset():
+            for window in calibration:
+                yield [window[np.newaxis].astype(np.float32)]
+        converter.representative_dataset = representative_dataset
+
+    with open(path, "wb") as fh:
+        fh.write(converter.convert())
+    return path
+
+
+def tflite_predictor(path):
+    interpreter = tf.lite.Interpreter(model_path=path)
+    inp = interpreter.get_input_details()[0]
+    out = interpreter.get_output_details()[0]
+    state = {"batch": None}
+
+    def predict(x):
+        if state["batch"] != len(x):
+            interpreter.resize_tensor_input(inp["index"], [len(x), *inp["shape"][1:]])
+            interpreter.allocate_tensors()
+            state["batch"] = len(x)
+        interpreter.set_tensor(inp["index"], x.astype(np.float32))
+        interpreter.invoke()
+        return interpreter.get_tensor(out["index"]).copy()
+
+    return predict
+
+
+# --- 3️⃣ Benchmark: single-window latency and batched throughput ---
+def benchmark(predict, X):
+    window = X[:1].astype(np.float32)
+    batch = np.resize(X, (BENCH_BATCH, *X.shape[1:])).astype(np.float32)
+
+    # Warm up (tracing / XLA compilation / tensor allocation)
+    predict(window)
+    latencies = []
+    for _ in range(LATENCY_RUNS):
+        start = time.perf_counter()
+        predict(window)
+        latencies.append(time.perf_counter() - start)
+
+    predict(batch)
+    start = time.perf_counter()
+    runs = 10
+    for _ in range(runs):
+        predict(batch)
+    throughput = runs * BENCH_BATCH / (time.perf_counter() - start)
+    return float(np.median(latencies) * 1e3), float(throughput)
+
+
+def artifact_size_kb(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(root, f))
+                   for root, _, files in os.walk(path) for f in files) / 1024
+    return os.path.getsize(path) / 1024
+
+
+def export_one(stock_name, model_name, formats):
+    """Export, check and benchmark one model; returns (summary rows, failed formats)."""
+    model_path = f"{MODELS_FOLDER}/{stock_name}_{model_name}.keras"
+    if not os.path.exists(model_path):
+        print(f"⚠️ Missing trained model {model_path} — run train_models.py first.")
+        return [], []
+
+    X_train, X_test, _, y_test = load_dataset(f"{stock_name}_seq.npz")
+    X_test = X_test.astype(np.float32)
+    input_shape = X_test.shape[1:]
+    model = tf.keras.models.load_model(model_path)
+
+    float_preds = model.predict(X_test, verbose=0)
+    float_metrics = var_metrics(y_test, float_preds)
+    calibration = X_train[-CALIBRATION_SAMPLES:]
+
+    rows, failed = [], []
+    for fmt in formats:
+        base = f"{EXPORT_FOLDER}/{stock_name}_{model_name}"
+        try:
+            if fmt == "keras":
+                path = model_path
+                predict = lambda x: model.predict(x, verbose=0)
+            elif fmt == "xla":
+                path = export_xla(model, input_shape, f"{base}_xla")
+                predict = xla_predictor(path)
+            elif fmt == "tflite_dynamic":
+                path = export_tflite(model, f"{base}_dynamic.tflite", "dynamic")
+                predict = tflite_predictor(path)
+            elif fmt == "tflite_int8":
+                path = export_tflite(model, f"{base}_int8.tflite", "int8", calibration)
+                predict = tflite_predictor(path)
+            else:
+                raise ValueError(f"Unknown export format: {fmt}")
+
+            latency_ms, throughput = benchmark(predict, X_test)
+            preds = predict(X_test)
+        except Exception as exc:
+            print(f"❌ {stock_name}-{model_name} [{fmt}] failed: {exc}")
+            failed.append(fmt)
+            continue
+
+        metrics = var_metrics(y_test, preds)
+        d95 = metrics["ViolRate95"] - float_metrics["ViolRate95"]
+        d99 = metrics["ViolRate99"] - float_metrics["ViolRate99"]
+        rows.append({
+            "Stock": stock_name,
+            "Model": model_name,
+            "Format": fmt,
+            "SizeKB": artifact_size_kb(path),
+            "Latency_ms": latency_ms,
+            "Throughput_per_s": throughput,
+            "ViolRate95": metrics["ViolRate95"],
+            "ViolRate99": metrics["ViolRate99"],
+            "dViolRate95": d95,
+            "dViolRate99": d99,
+            "MaxAbsPredDiff": float(np.max(np.abs(preds.flatten() - float_preds.flatten()))),
+            "Parity": bool(abs(d95) <= PARITY_TOLERANCE and abs(d99) <= PARITY_TOLERANCE),
+        })
+        print(f"✅ {stock_name}-{model_name} [{fmt}] {latency_ms:.3f} ms/window, "
+              f"{throughput:,.0f} windows/s, ΔViolRate95={d95:+.4f}")
+    return rows, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export trained models to optimized CPU artifacts.")
+    parser.add_argument("--stocks", nargs="*", help="default: every processed dataset")
+    parser.add_argument("--models", nargs="*", default=list(MODEL_BUILDERS), choices=list(MODEL_BUILDERS))
+    parser.add_argument("--formats", nargs="*", default=FORMATS, choices=FORMATS)
+    args = parser.parse_args()
+
+    os.makedirs(EXPORT_FOLDER, exist_ok=True)
+    stocks = args.stocks or list_stocks()
+
+    rows, failures = [], []
+    for stock_name in stocks:
+        for model_name in args.models:
+            print(f"\n📦 Exporting {stock_name}-{model_name}...")
+            model_rows, failed = export_one(stock_name, model_name, args.formats)
+            rows.extend(model_rows)
+            failures.extend(f"{stock_name}-{model_name} [{fmt}]" for fmt in failed)
+
+    df = pd.DataFrame(rows)
+    df.to_csv(EXPORT_SUMMARY, index=False)
+    print(f"\n✅ Export summary saved to {EXPORT_SUMMARY}")
+    print(df)
+
+    if failures:
+        print(f"\n❌ {len(failures)} export(s) failed: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,24 @@
 # ---- imports ----
-import os, pandas as pd, textwrap, glob
+import os, re, glob, json, hashlib
+import numpy as np
+import pandas as pd
+from string import Template
+from scripts.tickers import load_tickers, add_market
 
 RESULTS_FOLDER = "results"
 SUMMARY_CSV = os.path.join(RESULTS_FOLDER, "var_summary.csv")
 OUTPUT_MD = os.path.join(RESULTS_FOLDER, "final_report.md")
 OUTPUT_DOCX = os.path.join(RESULTS_FOLDER, "final_report.docx")
+OUTPUT_HTML = os.path.join(RESULTS_FOLDER, "final_report.html")
+CACHE_FILE = os.path.join(RESULTS_FOLDER, ".report_cache.json")
+TEMPLATE_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "report")
 
-# ---- function definitions ----
+REPORT_TITLE = "Deep Learning–Based Value-at-Risk Analysis"
+MSE_PATTERN = re.compile(r"([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)")
+MAX_LISTED_STOCKS = 10  # abstract names at most this many stocks
+
+
+# ---- data loading ----
 def read_summary():
     if not os.path.exists(SUMMARY_CSV):
         raise FileNotFoundError(f"Missing {SUMMARY_CSV}. Run var_backtest first.")
@@ -18,71 +30,213 @@ def read_summary():
 
 
 def read_mse_files():
-    mse_dict = {}
-    files = glob.glob(os.path.join(RESULTS_FOLDER, "*_mse.txt"))
-    for f in files:
-        name = os.path.basename(f).replace("_mse.txt", "")
-        try:
-            stock, model = name.split("_", 1)
-        except ValueError:
+    rows = []
+    for f in glob.glob(os.path.join(RESULTS_FOLDER, "*_mse.txt")):
+        name = os.path.basename(f)[:-len("_mse.txt")]
+        if "_" not in name:
             continue
+        stock, model = name.split("_", 1)
         try:
             with open(f, "r") as fh:
-                txt = fh.read()
-            import re
-            m = re.search(r"([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)", txt)
+                m = MSE_PATTERN.search(fh.read())
             mse = float(m.group(1)) if m else None
-        except Exception:
+        except OSError:
             mse = None
-        mse_dict[(stock, model)] = mse
-    return mse_dict
-
-
-def best_model_by_criteria(df, mse_dict):
-    results = {}
-    for stock in df["Stock"].unique():
-        subset = df[df["Stock"] == stock].copy()
-        subset["dist_viol95"] = (subset["ViolRate95"] - 0.05).abs()
-        subset_sorted = subset.sort_values(
-            by=["dist_viol95", "Kupiec_p95", "ViolRate99"], ascending=[True, False, True]
-        ).reset_index(drop=True)
-        top = subset_sorted.iloc[0]
-        model = top["Model"]
-        mse = mse_dict.get((stock, model))
-        results[stock] = {
-            "Model": model,
-            "VaR95": top["VaR95"],
-            "VaR99": top["VaR99"],
-            "ViolRate95": top["ViolRate95"],
-            "ViolRate99": top["ViolRate99"],
-            "Kupiec_p95": top["Kupiec_p95"],
-            "Kupiec_p99": top["Kupiec_p99"],
-            "MSE": mse
-        }
-    return results
-
-
-def market_level_summary(df):
-    india = ["Reliance", "Infosys"]
-    us = ["Apple", "Tesla"]
-    market_summary = {}
-    for name, stock_list in [("India", india), ("US", us)]:
-        sub = df[df["Stock"].isin(stock_list)]
-        if sub.empty:
-            market_summary[name] = None
-            continue
-        avg_viol95 = sub["ViolRate95"].mean()
-        avg_viol99 = sub["ViolRate99"].mean()
-        pct_kupiec95_ok = (sub["Kupiec_p95"] > 0.05).sum() / len(sub) if len(sub) > 0 else None
-        market_summary[name] = {
-            "CountStocks": len(sub["Stock"].unique()),
-            "AvgViolRate95": float(avg_viol95),
-            "AvgViolRate99": float(avg_viol99),
-            "PctKupiec95_OK": float(pct_kupiec95_ok) if pct_kupiec95_ok is not None else None
-        }
-    return market_summary
+        rows.append((stock, model, mse))
+    return pd.DataFrame(rows, columns=["Stock", "Model", "MSE"])
+
+
+# ---- aggregates (one vectorized pass each) ----
+def best_model_by_criteria(df, mse):
+    ranked = df.assign(dist_viol95=(df["ViolRate95"] - 0.05).abs()).sort_values(
+        by=["Stock", "dist_viol95", "Kupiec_p95", "ViolRate99"], ascending=[True, True, False, True]
+    )
+    best = ranked.drop_duplicates("Stock").merge(mse, on=["Stock", "Model"], how="left")
+    cols = ["Stock", "Model", "VaR95", "VaR99", "ViolRate95", "ViolRate99", "Kupiec_p95", "Kupiec_p99", "MSE"]
+    return best[cols].reset_index(drop=True)
+
+
+def market_level_summary(df, tickers):
+    df = add_market(df, tickers)
+    grouped = df.groupby("Market")
+    summary = pd.DataFrame({
+        "CountStocks": grouped["Stock"].nunique(),
+        "AvgViolRate95": grouped["ViolRate95"].mean(),
+        "AvgViolRate99": grouped["ViolRate99"].mean(),
+        "PctKupiec95_OK": (df["Kupiec_p95"] > 0.05).groupby(df["Market"]).mean(),
+    })
+    # Markets from the metadata table with no results still get a line
+    markets = list(dict.fromkeys([*tickers["Market"], *summary.index]))
+    return summary.reindex(markets)
+
+
+def interpret_violations(viol_rate95):
+    return np.select(
+        # Bands around the expected 5% breach frequency (rates are fractions)
+        [viol_rate95.isna(), viol_rate95 < 0.04, viol_rate95 <= 0.06, viol_rate95 <= 0.10],
+        [
+            "No violation data available.",
+            "Conservative — overestimates downside risk (safer, fewer breaches).",
+            "Well-calibrated — violation rate close to 5%, aligns with expected VaR95.",
+            "Aggressive — underestimates risk moderately (higher-than-expected breaches).",
+        ],
+        default="Unreliable — far exceeds expected breaches, invalid VaR calibration.",
+    )
+
+
+# ---- section contexts ----
+def join_names(names):
+    names = list(names)
+    return names[0] if len(names) == 1 else ", ".join(names[:-1]) + f", and {names[-1]}"
+
+
+def abstract_context(df):
+    stocks, models = df["Stock"].unique(), df["Model"].unique()
+    listed = ", ".join(stocks[:MAX_LISTED_STOCKS])
+    if len(stocks) > MAX_LISTED_STOCKS:
+        listed += f", … +{len(stocks) - MAX_LISTED_STOCKS} more"
+    return {
+        "n_stocks": len(stocks),
+        "stock_list": listed,
+        "n_models": len(models),
+        "model_list": join_names(models),
+    }
+
+
+def results_context(best, market_summary):
+    lines = []
+    for row in best.itertuples(index=False):
+        kupiec = row.Kupiec_p95 if pd.notna(row.Kupiec_p95) else "NA"
+        line = (f"- {row.Stock}: Best model = {row.Model} | VaR95={row.VaR95:.5f}, "
+                f"ViolRate95={row.ViolRate95:.3f}, Kupiec_p95={kupiec}")
+        if pd.notna(row.MSE):
+            line += f", MSE={row.MSE:.6g}"
+        lines.append(line)
+
+    market_lines = []
+    for mkt, vals in market_summary.iterrows():
+        if pd.isna(vals["CountStocks"]):
+            market_lines.append(f"- {mkt}: insufficient data for aggregated summary.")
+        else:
+            market_lines.append(
+                f"- {mkt}: Avg ViolRate95 = {vals['AvgViolRate95']:.3f}, "
+                f"Avg ViolRate99 = {vals['AvgViolRate99']:.3f}, "
+                f"% models passing Kupiec95 = {vals['PctKupiec95_OK']:.2%}"
+            )
+    return {"best_models": "\n".join(lines), "market_lines": "\n".join(market_lines)}
+
+
+def discussion_context(df, best):
+    interp = interpret_violations(best["ViolRate95"])
+    lines = "- **" + best["Stock"] + " (" + best["Model"] + ")** → " + interp
+    return {"interpretations": "\n".join(lines), **kupiec_context(df)}
+
+
+def kupiec_context(df):
+    n = len(df)
+    pass95 = int((df["Kupiec_p95"] > 0.05).sum())
+    pass99 = int((df["Kupiec_p99"] > 0.05).sum())
+    return {"kupiec_line": (f"{pass95} of {n} stock/model pairs pass the Kupiec unconditional-coverage "
+                            f"test at VaR95 and {pass99} of {n} at VaR99 (p > 0.05).")}
+
+
+def findings_context(df, market_summary):
+    # Markets ranked by how close their average VaR95 violation rate is to 5%
+    ranked = market_summary.dropna(subset=["CountStocks"])
+    ranked = ranked.assign(err=(ranked["AvgViolRate95"] - 0.05).abs()).sort_values("err")
+    ranking = [
+        f"- **{mkt}** ({int(vals['CountStocks'])} stocks): avg ViolRate95 = {vals['AvgViolRate95']:.3f} "
+        f"vs 0.050 expected, {vals['PctKupiec95_OK']:.0%} of models pass Kupiec95."
+        for mkt, vals in ranked.iterrows()
+    ]
+    if len(ranked) > 1:
+        market_takeaway = (f"**{ranked.index[0]}** stocks are closest to the expected VaR95 violation "
+                           f"frequency and **{ranked.index[-1]}** stocks are furthest from it.")
+    elif len(ranked) == 1:
+        market_takeaway = f"Only the {ranked.index[0]} market has results, so no cross-market comparison is drawn."
+    else:
+        market_takeaway = "No market has backtest results yet."
+
+    by_model = (df["ViolRate95"] - 0.05).abs().groupby(df["Model"]).mean().dropna().sort_values()
+    if len(by_model) > 1:
+        model_takeaway = (f"Across architectures, **{by_model.index[0]}** has the lowest average VaR95 "
+                          f"coverage error ({by_model.iloc[0]:.3f}) and **{by_model.index[-1]}** "
+                          f"the highest ({by_model.iloc[-1]:.3f}).")
+    else:
+        model_takeaway = "Only one architecture was evaluated, so no cross-architecture comparison is drawn."
+
+    return {
+        **kupiec_context(df),
+        "market_ranking": "\n".join(ranking) or "- No market-level results.",
+        "market_takeaway": market_takeaway,
+        "model_takeaway": model_takeaway,
+    }
+
+
+def report_sections(df, best, market_summary):
+    # (title, template, frames the section is rendered from, context builder)
+    static = ()
+    backtests = df[["Stock", "Model", "ViolRate95", "Kupiec_p95", "Kupiec_p99"]]
+    findings = (backtests, market_summary.reset_index())
+    return [
+        ("Abstract", "abstract.md", (df[["Stock", "Model"]],), lambda: abstract_context(df)),
+        ("Methodology", "methodology.md", (df[["Model"]].drop_duplicates(),),
+         lambda: {"model_list": join_names(df["Model"].unique())}),
+        ("Results", "results.md", (best, market_summary.reset_index()),
+         lambda: results_context(best, market_summary)),
+        ("Interpretation of VaR Violation Rates", "interpretation.md", static, dict),
+        ("Discussion & Interpretation", "discussion.md", (best[["Stock", "Model", "ViolRate95"]], backtests),
+         lambda: discussion_context(df, best)),
+        ("Key Takeaways", "takeaways.md", findings, lambda: findings_context(df, market_summary)),
+        ("Conclusion", "conclusion.md", findings, lambda: findings_context(df, market_summary)),
+    ]
+
+
+# ---- incremental rendering ----
+def section_hash(template, frames):
+    h = hashlib.sha1(template.encode("utf-8"))
+    for frame in frames:
+        h.update(",".join(map(str, frame.columns)).encode("utf-8"))
+        h.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def render_sections(sections):
+    """Render each section, reusing cached output for sections whose rows are unchanged.
+
+    Returns the rendered ``(title, markdown)`` pairs, whether any section changed and
+    the updated cache, which the caller saves with ``save_cache`` once the reports are written.
+    """
+    cache = {}
+    if os.path.exists(CACHE_FILE):
+        with open(CACHE_FILE, "r", encoding="utf-8") as fh:
+            cache = json.load(fh)
+
+    rendered, reused = [], 0
+    for title, template_name, frames, context in sections:
+        with open(os.path.join(TEMPLATE_FOLDER, template_name), "r", encoding="utf-8") as fh:
+            template = fh.read()
+        digest = section_hash(template, frames)
+        cached = cache.get(title)
+        if cached and cached["hash"] == digest:
+            body = cached["markdown"]
+            reused += 1
+        else:
+            body = Template(template).safe_substitute(context()).strip("\n")
+            cache[title] = {"hash": digest, "markdown": body}
+        rendered.append((title, body))
+
+    print(f"♻️ {reused}/{len(sections)} report sections unchanged — reused.")
+    return rendered, reused < len(sections), cache
 
 
+def save_cache(cache):
+    os.makedirs(RESULTS_FOLDER, exist_ok=True)
+    with open(CACHE_FILE, "w", encoding="utf-8") as fh:
+        json.dump(cache, fh)
+
+
+# ---- writers ----
 def write_markdown(md_text):
     os.makedirs(RESULTS_FOLDER, exist_ok=True)
     with open(OUTPUT_MD, "w", encoding="utf-8") as fh:
@@ -90,7 +244,18 @@ def write_markdown(md_text):
     print(f"✅ Markdown report written to {OUTPUT_MD}")
 
 
-def write_docx(md_text):
+def add_runs(paragraph, text):
+    # **bold** segments alternate with plain text when split on the marker
+    for i, part in enumerate(text.split("**")):
+        if part:
+            paragraph.add_run(part).bold = (i % 2 == 1)
+
+
+def is_underline(line):
+    return len(line) > 2 and set(line) == {"-"}
+
+
+def write_docx(sections):
     try:
         from docx import Document
     except ImportError:
@@ -98,187 +263,90 @@ def write_docx(md_text):
         return
 
     doc = Document()
-    for block in md_text.split("\n\n"):
-        if block.strip().startswith("Abstract"):
-            doc.add_heading("Abstract", level=1)
-            doc.add_paragraph(block.replace("Abstract", "").strip())
-        elif block.strip().startswith("Methodology"):
-            doc.add_heading("Methodology", level=1)
-            doc.add_paragraph(block.replace("Methodology", "").strip())
-        elif block.strip().startswith("Results"):
-            doc.add_heading("Results", level=1)
-            lines = block.splitlines()
-            for ln in lines[1:]:
-                doc.add_paragraph(ln.strip(), style='List Bullet')
-        elif block.strip().startswith("Discussion & Interpretation"):
-            doc.add_heading("Discussion & Interpretation", level=1)
-            doc.add_paragraph(block.replace("Discussion & Interpretation", "").strip())
-        elif block.strip().startswith("Conclusion"):
-            doc.add_heading("Conclusion", level=1)
-            doc.add_paragraph(block.replace("Conclusion", "").strip())
-        else:
-            doc.add_paragraph(block.strip())
+    # Resolve styles once: looking them up by name on every paragraph dominates large reports
+    bullet, number = doc.styles["List Bullet"], doc.styles["List Number"]
+    grid = doc.styles["Table Grid"]
+    for title, body in sections:
+        doc.add_heading(title, level=1)
+        lines = [ln.strip() for ln in body.splitlines()]
+        # Drop the section's own heading (title + dashed underline)
+        if len(lines) > 1 and is_underline(lines[1]):
+            lines = lines[2:]
+
+        i = 0
+        while i < len(lines):
+            ln = lines[i]
+            nxt = lines[i + 1] if i + 1 < len(lines) else ""
+            if not ln or is_underline(ln):
+                pass
+            elif is_underline(nxt):
+                doc.add_heading(ln.replace("**", ""), level=2)
+            elif ln.startswith("|"):
+                rows = []
+                while i < len(lines) and lines[i].startswith("|"):
+                    cells = [c.strip() for c in lines[i].strip("|").split("|")]
+                    if not all(set(c) <= {"-", ":"} for c in cells):
+                        rows.append(cells)
+                    i += 1
+                table = doc.add_table(rows=len(rows), cols=len(rows[0]), style=grid)
+                for r, cells in enumerate(rows):
+                    for c, text in enumerate(cells):
+                        add_runs(table.cell(r, c).paragraphs[0], text)
+                continue
+            elif ln.startswith("- "):
+                add_runs(doc.add_paragraph(style=bullet), ln[2:])
+            elif re.match(r"^\d+\.\s", ln):
+                add_runs(doc.add_paragraph(style=number), ln.split(" ", 1)[1])
+            else:
+                add_runs(doc.add_paragraph(), ln)
+            i += 1
     doc.save(OUTPUT_DOCX)
     print(f"✅ DOCX report written to {OUTPUT_DOCX}")
 
 
-# ---- craft narrative (your version) ----
-def craft_narrative(df, best_models, market_summary):
-    abstract = textwrap.dedent("""
-    Abstract
-    --------
-    This report summarizes the automated analysis of predictive Value-at-Risk (VaR) models
-    trained on four stocks (Reliance, Infosys, Apple, Tesla) using four neural architectures:
-    MLP, CNN1D, LSTM, and Transformer. The objective is to evaluate model calibration for
-    VaR95 and VaR99 and to identify the best-performing architecture per stock based on
-    violation rates and Kupiec backtesting results.
-    """)
-
-    methodology = textwrap.dedent("""
-    Methodology
-    -----------
-    1. Datasets: Daily OHLCV series were used to compute daily log returns.
-    2. Input Preparation: Rolling windows of past returns were used to predict the next day’s return.
-    3. Models: MLP, CNN1D, LSTM, and Transformer architectures were trained separately for each stock.
-    4. VaR Estimation: Empirical quantiles from predicted returns were used to compute VaR95 and VaR99.
-    5. Backtesting: Violation frequencies (actual < VaR) and Kupiec Likelihood-Ratio (LR) tests validated statistical coverage.
-    """)
-
-    res_lines = ["Per-stock Best Models (automated selection):\n"]
-    for stock, info in best_models.items():
-        line = f"- {stock}: Best model = {info['Model']} | VaR95={info['VaR95']:.5f}, ViolRate95={info['ViolRate95']:.3f}, Kupiec_p95={info['Kupiec_p95'] if pd.notna(info['Kupiec_p95']) else 'NA'}"
-        if info.get("MSE") is not None:
-            line += f", MSE={info['MSE']:.6g}"
-        res_lines.append(line)
-    results_text = "\n".join(res_lines)
-
-    market_lines = ["Market-level observations:"]
-    for mkt, vals in market_summary.items():
-        if vals is None:
-            market_lines.append(f"- {mkt}: insufficient data for aggregated summary.")
-        else:
-            market_lines.append(f"- {mkt}: Avg ViolRate95 = {vals['AvgViolRate95']:.3f}, Avg ViolRate99 = {vals['AvgViolRate99']:.3f}, % models passing Kupiec95 = {vals['PctKupiec95_OK']:.2%}")
-
-    var_interpretation = textwrap.dedent("""
-    Interpretation of VaR Violation Rates
-    ------------------------------------
-    Expected violation frequencies:
-    - **VaR95 → 5%** expected violations
-    - **VaR99 → 1%** expected violations
-
-    | Observed Violations       | Interpretation                                     |
-    |----------------------------|----------------------------------------------------|
-    | Slightly below expected    | Model is **conservative** (overestimates risk)     |
-    | Slightly above expected    | Model is **aggressive** (underestimates risk)      |
-    | Much higher than expected  | Model **fails** — unreliable VaR                   |
-    | Exactly near expected      | Model is **well-calibrated**                       |
-    """)
-
-    discussions = ["Discussion & Interpretation"]
-    discussions.append("Kupiec likelihood-ratio backtesting reveals that all models exhibit infinite or extremely large LR values and p-values = 0.0, indicating statistical rejection of correct VaR calibration.")
-    discussions.append("")
-    discussions.append("Per-stock VaR interpretation:")
-    for stock, info in best_models.items():
-        v = info["ViolRate95"]
-        if pd.isna(v):
-            interp = "No violation data available."
-        elif v < 0.4:
-            interp = "Conservative — overestimates downside risk (safer, fewer breaches)."
-        elif 0.4 <= v <= 0.6:
-            interp = "Well-calibrated — violation rate close to 5%, aligns with expected VaR95."
-        elif 0.6 < v <= 1.0:
-            interp = "Aggressive — underestimates risk moderately (higher-than-expected breaches)."
-        else:
-            interp = "Unreliable — far exceeds expected breaches, invalid VaR calibration."
-        discussions.append(f"- **{stock} ({info['Model']})** → {interp}")
-
-    key_takeaways = textwrap.dedent("""
-    Key Takeaways
-    -------------
-    1. **Kupiec p-values = 0.0 across all models**, confirming poor statistical calibration.
-    2. **US market stocks (Apple, Tesla)** show lower violation rates and better stability.
-    3. **Indian stocks (Reliance, Infosys)** display higher volatility and more frequent VaR breaches.
-    4. Across architectures, **LSTM and Transformer** tend to generalize better but still fail statistical VaR tests.
-    5. Deep learning models capture general trend behavior but **struggle with tail-risk prediction**.
-    """)
-
-    conclusion = textwrap.dedent("""
-    Conclusion
-    ----------
-    **Kupiec Backtest Summary:**
-    All models fail the Kupiec test for unconditional coverage (p = 0.00), meaning none accurately predict the expected number of VaR exceedances. The likelihood ratio statistics diverge, confirming systematic miscalibration across datasets.
-
-    **Market-Wise Insights:**
-    - **US stocks (Apple, Tesla)** show closer adherence to expected 5%/1% violation frequencies — more predictable and stable.
-    - **Indian stocks (Reliance, Infosys)** show significantly higher violations — more volatility and frequent tail shocks.
-
-    **Predictability is Higher in the US Market**
-    Across all four models (MLP, CNN-1D, LSTM, Transformer), the US stocks consistently showed lower VaR violation rates.
-    This indicates that:
-    1. Future returns in the US market are more stable.
-    2. Price movements exhibit lower short-term randomness.
-    3. Deep learning models are able to capture return patterns more reliably.
-                                 
-    In contrast, the Indian market displayed:
-    1. Higher volatility clusters.
-    2. Sharper shocks.
-    3. More irregular return behavior.
-    4. More frequent VaR breaches.
-    This makes the Indian market comparatively harder to model and predict.
-
-    **Risk Coverage (VaR 95% and 99%) is Better in US Stocks**
-    The VaR results show that:
-    1. US stocks (AAPL, TSLA) had violation rates closer to the 5% and 1% theoretical expectations.
-    2. Indian stocks (RELIANCE, INFY) exceeded these thresholds more often.
-
-    This suggests that:
-    1. The US market is more efficient and liquid, allowing models to estimate risk accurately.
-    2. The Indian market contains more tail-risk events, making VaR estimation more challenging.
-
-    US stocks passed more Kupiec tests, meaning the actual exceedances were statistically consistent with expectations,
-    while Indian stocks failed more often, indicating underestimation of risk.
-    
-    Overall, US (developed) markets are more predictable and display better risk-behavior consistency,
-    allowing deep learning models to estimate VaR and future returns more effectively.
-    Indian (emerging) markets show higher volatility, more irregular return dynamics,
-    and more tail events, making forecasting and VaR estimation more challenging.
-
-    **Recommendations**
-    -----------------------------------------
-    1. **Interpret VaR conservatively** for Indian stocks — observed violations exceed theoretical limits.
-    2. **Do not rely on Kupiec p-values** as validation since all models fail the statistical backtest.
-    3. **Treat LSTM/Transformer outputs as directional risk indicators**, not precise probabilistic VaR forecasts.
-    4. **US market VaR estimates can be cautiously interpreted**, especially around stable periods.
-    5. **Recalibrate models with rolling-window updates** to adapt to changing volatility regimes.
-    6. **Include alternative risk metrics** (Expected Shortfall, Conditional VaR) for better tail coverage assessment.
-    """)
-
-    return "\n\n".join([
-        abstract,
-        methodology,
-        "Results",
-        results_text,
-        "\n".join(market_lines),
-        var_interpretation,
-        "\n".join(discussions),
-        key_takeaways,
-        conclusion
-    ])
+def write_html(md_text):
+    try:
+        import markdown
+    except ImportError:
+        print("⚠️ markdown not installed — skipping HTML generation. (pip install markdown)")
+        return
+
+    with open(os.path.join(TEMPLATE_FOLDER, "report.html"), "r", encoding="utf-8") as fh:
+        page = Template(fh.read())
+    body = markdown.markdown(md_text, extensions=["tables"])
+    with open(OUTPUT_HTML, "w", encoding="utf-8") as fh:
+        fh.write(page.safe_substitute(title=REPORT_TITLE, body=body))
+    print(f"✅ HTML report written to {OUTPUT_HTML}")
 
 
 # ---- main block ----
-if __name__ == "__main__":
+def main():
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
     os.chdir("..")
 
     df = read_summary()
-    mse_dict = read_mse_files()
-    best = best_model_by_criteria(df, mse_dict)
-    market_summary = market_level_summary(df)
-    md = craft_narrative(df, best, market_summary)
+    tickers = load_tickers()
+    best = best_model_by_criteria(df, read_mse_files())
+    market_summary = market_level_summary(df, tickers)
+
+    sections, changed, cache = render_sections(report_sections(df, best, market_summary))
+    outputs = [OUTPUT_MD, OUTPUT_DOCX, OUTPUT_HTML]
+    if not changed and all(os.path.exists(path) for path in outputs):
+        print("✅ No section changed — existing reports are up to date.")
+        return
+
+    md = "\n\n\n".join(body for _, body in sections) + "\n"
     write_markdown(md)
-    write_docx(md)
+    write_docx(sections)
+    write_html(md)
+    # Only now: a failed or interrupted write must not leave the sections marked as current
+    save_cache(cache)
 
     print("\n✅ Report generation complete.")
     print("📄 Markdown -> results/final_report.md")
-    print("📄 Word     -> results/final_report.docx\n")
+    print("📄 Word     -> results/final_report.docx")
+    print("📄 HTML     -> results/final_report.html\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
+"""Model builders. Output heads are pinned to float32 so they stay stable under a mixed_bfloat16 policy."""
 from tensorflow.keras.models import Sequential, Model
 from tensorflow.keras.layers import (
     Dense, Flatten, Conv1D, MaxPooling1D, Dropout, BatchNormalization,
     LSTM, Bidirectional, Input, MultiHeadAttention, Add,
-    LayerNormalization, GlobalAveragePooling1D
+    LayerNormalization, GlobalAveragePooling1D, Concatenate
 )
+import numpy as np
 import tensorflow as tf
 
 
@@ -18,7 +20,7 @@ def build_mlp(input_shape):
         BatchNormalization(),
         Dropout(0.2),
         Dense(32, activation='relu'),
-        Dense(1)
+        Dense(1, dtype='float32')
     ])
     model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=1e-3), loss='mse')
     return model
@@ -40,7 +42,7 @@ def build_cnn(input_shape):
 
     x = Dense(64, activation='relu')(x)
     x = Dropout(0.3)(x)
-    outputs = Dense(1)(x)
+    outputs = Dense(1, dtype='float32')(x)
 
     model = Model(inputs, outputs)
     model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=1e-3), loss='mse')
@@ -55,7 +57,7 @@ def build_lstm(input_shape):
         Bidirectional(LSTM(32, return_sequences=False)),
         Dense(64, activation='relu'),
         Dropout(0.2),
-        Dense(1)
+        Dense(1, dtype='float32')
     ])
     model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=5e-4), loss='mse')
     return model
@@ -82,8 +84,64 @@ def build_transformer(input_shape, num_heads=4, ff_dim=64):
     x = GlobalAveragePooling1D()(out2)
     x = Dense(64, activation='relu')(x)
     x = Dropout(0.2)(x)
-    outputs = Dense(1)(x)
+    outputs = Dense(1, dtype='float32')(x)
 
     model = Model(inputs, outputs)
     model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=3e-4), loss='mse')
     return model
+
+
+# --- 5️⃣ Student MLP (narrow, distilled from a heavier teacher) ---
+def build_student_mlp(input_shape):
+    model = Sequential([
+        Flatten(input_shape=input_shape),
+        Dense(32, activation='relu'),
+        Dense(16, activation='relu'),
+        Dense(1, dtype='float32')
+    ])
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=1e-3), loss='mse')
+    return model
+
+
+# --- 6️⃣ Student CNN1D (dilated causal convs covering the 30-step window) ---
+def build_student_cnn(input_shape):
+    inputs = Input(shape=input_shape)
+    x = inputs
+    for dilation in (1, 2, 4, 8):
+        x = Conv1D(16, 3, padding='causal', dilation_rate=dilation, activation='relu')(x)
+    x = GlobalAveragePooling1D()(x)
+    outputs = Dense(1, dtype='float32')(x)
+
+    model = Model(inputs, outputs)
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=1e-3), loss='mse')
+    return model
+
+
+# --- 7️⃣ Ensemble (trained architectures fused into one multi-output graph) ---
+def build_ensemble(members, input_shape, weights=None, learn_weights=False):
+    """Wrap trained ``{name: model}`` members behind one shared input.
+
+    The returned model outputs a dict with every member's prediction plus an
+    ``"Ensemble"`` head that linearly combines them (equal weights by default).
+    Members are frozen; with ``learn_weights=True`` only the combination
+    weights train when the model is fitted on ``{"Ensemble": y}``.
+    """
+    inputs = Input(shape=input_shape)
+    outputs = {}
+    for name, member in members.items():
+        member.trainable = False
+        # Re-wrap so nested model names are unique inside the fused graph
+        # training=False keeps member Dropout/BatchNorm in inference mode when fitting the weights
+        outputs[name] = Model(member.inputs, member.outputs, name=name)(inputs, training=False)
+
+    stacked = Concatenate(name="member_preds", dtype='float32')(list(outputs.values()))
+    combine = Dense(1, use_bias=False, trainable=learn_weights, name="Ensemble", dtype='float32')
+    outputs["Ensemble"] = combine(stacked)
+
+    if weights is None:
+        weights = np.full(len(members), 1.0 / len(members))
+    combine.set_weights([np.asarray(weights, dtype="float32").reshape(-1, 1)])
+
+    model = Model(inputs, outputs, name="ensemble")
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=1e-3), loss={"Ensemble": "mse"})
+    return model
@@ -6,34 +6,47 @@ import os
 # Folder paths
 DATA_FOLDER = "data"
 OUTPUT_FOLDER = "data/processed"
-os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 
 # Parameters
 WINDOW_SIZE = 30  # use last 30 days to predict next day
+TEST_SPLIT = 0.8  # fraction of windows used for training; the scaler is fitted on these only
 
-# Load and process each dataset
-for file in os.listdir(DATA_FOLDER):
-    if not file.endswith(".csv"):
-        continue
 
-    stock_name = file.replace("_data.csv", "")
-    print(f"Processing {stock_name}...")
+def main():
+    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 
-    df = pd.read_csv(os.path.join(DATA_FOLDER, file))
-    df.dropna(subset=["LogReturn"], inplace=True)
-    
-    # Scale the log returns
-    scaler = StandardScaler()
-    scaled_returns = scaler.fit_transform(df[["LogReturn"]])
+    # Load and process each dataset
+    for file in os.listdir(DATA_FOLDER):
+        if not file.endswith("_data.csv"):
+            continue
 
-    X, y = [], []
-    for i in range(WINDOW_SIZE, len(scaled_returns)):
-        X.append(scaled_returns[i - WINDOW_SIZE:i])
-        y.append(scaled_returns[i])
+        stock_name = file.replace("_data.csv", "")
+        print(f"Processing {stock_name}...")
 
-    X, y = np.array(X), np.array(y)
-    
-    np.savez_compressed(f"{OUTPUT_FOLDER}/{stock_name}_seq.npz", X=X, y=y)
-    print(f"✅ Saved processed file: {OUTPUT_FOLDER}/{stock_name}_seq.npz")
+        df = pd.read_csv(os.path.join(DATA_FOLDER, file))
+        df.dropna(subset=["LogReturn"], inplace=True)
 
-print("All datasets processed successfully.")
+        # Scale the log returns, fitting only on the span the training windows cover
+        returns = df[["LogReturn"]].to_numpy(dtype=float)
+        split_idx = int(TEST_SPLIT * (len(returns) - WINDOW_SIZE))
+        scaler = StandardScaler()
+        scaler.fit(returns[:WINDOW_SIZE + split_idx])
+        scaled_returns = scaler.transform(returns)
+
+        X, y = [], []
+        for i in range(WINDOW_SIZE, len(scaled_returns)):
+            X.append(scaled_returns[i - WINDOW_SIZE:i])
+            y.append(scaled_returns[i])
+
+        X, y = np.array(X), np.array(y)
+
+        np.savez_compressed(f"{OUTPUT_FOLDER}/{stock_name}_seq.npz", X=X, y=y,
+                            returns=returns.flatten(),
+                            scaler_mean=scaler.mean_, scaler_scale=scaler.scale_)
+        print(f"✅ Saved processed file: {OUTPUT_FOLDER}/{stock_name}_seq.npz")
+
+    print("All datasets processed successfully.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+"""Local experiment registry (SQLite) for pipeline runs.
+
+Each run records its config, a hash of the processed data, the git
+revision, per-stage timings and every backtest metric. Artifacts are
+copied once into a content-addressed store and referenced by hash, so
+later runs overwriting ``results/`` or ``models/`` no longer lose earlier
+outputs.
+
+    python -m scripts.cli runs start --name nightly
+    python -m scripts.cli train ...          # stage timings attach to the open run
+    python -m scripts.cli runs record
+    python -m scripts.cli runs list
+    python -m scripts.cli runs best Tesla --metric CoverageError95 --last 30
+    python -m scripts.cli runs diff <run_a> <run_b>
+"""
+import argparse
+import ast
+import glob
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import uuid
+from datetime import datetime, timezone
+
+RESULTS_FOLDER = "results"
+MODELS_FOLDER = "models"
+PROCESSED_FOLDER = os.path.join("data", "processed")
+REGISTRY_DB = os.path.join(RESULTS_FOLDER, "runs.sqlite")
+ARTIFACT_STORE = os.path.join(RESULTS_FOLDER, "artifacts")
+# Run opened by ``runs start``; scripts.cli only logs stage timings while it exists
+OPEN_RUN_FILE = os.path.join(RESULTS_FOLDER, ".open_run.json")
+
+# Per-(stock, model) artifacts recognised by filename suffix
+ARTIFACT_SUFFIXES = {
+    "_preds.npz": "preds",
+    "_mse.txt": "mse",
+    "_VaR_plot.png": "plot",
+}
+# Run-level artifacts
+RUN_ARTIFACTS = ["var_summary.csv", "final_report.md", "final_report.docx", "final_report.html"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    name TEXT,
+    created_at TEXT NOT NULL,
+    config TEXT NOT NULL,
+    data_hash TEXT,
+    code_version TEXT
+);
+CREATE TABLE IF NOT EXISTS timings (
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    stage TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    argv TEXT
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    stock TEXT NOT NULL,
+    model TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    stock TEXT,
+    model TEXT,
+    kind TEXT NOT NULL,
+    sha1 TEXT NOT NULL,
+    path TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_created ON runs(created_at);
+CREATE INDEX IF NOT EXISTS idx_metrics_lookup ON metrics(stock, metric, run_id);
+CREATE INDEX IF NOT EXISTS idx_metrics_run ON metrics(run_id);
+CREATE INDEX IF NOT EXISTS idx_timings_run ON timings(run_id);
+CREATE INDEX IF NOT EXISTS idx_artifacts_run ON artifacts(run_id, stock, model, kind);
+"""
+
+
+def connect(path=REGISTRY_DB):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    # Registries created before stage argv was stored
+    if "argv" not in {row[1] for row in conn.execute("PRAGMA table_info(timings)")}:
+        conn.execute("ALTER TABLE timings ADD COLUMN argv TEXT")
+    return conn
+
+
+# --- 1️⃣ Run provenance ---
+def file_sha1(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def data_hash(folder=PROCESSED_FOLDER):
+    h = hashlib.sha1()
+    for path in sorted(glob.glob(os.path.join(folder, "*.npz"))):
+        h.update(os.path.basename(path).encode())
+        h.update(file_sha1(path).encode())
+    return h.hexdigest()
+
+
+def code_version():
+    try:
+        rev = subprocess.run(["git", "rev-parse", "HEAD"],
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--", "scripts", "main.py"],
+                               capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{rev}-dirty" if dirty else rev
+
+
+def pipeline_config():
+    # Hyper-parameters are read from source rather than imported, so recording stays TensorFlow-free
+    config = {}
+    for path in ("scripts/preprocess_data.py", "scripts/train_models.py"):
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as fh:
+            tree = ast.parse(fh.read())
+        for node in tree.body:
+            if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                    and isinstance(node.targets[0], ast.Name) and node.targets[0].id.isupper()):
+                try:
+                    value = ast.literal_eval(node.value)
+                except ValueError:
+                    continue
+                config[node.targets[0].id] = sorted(value) if isinstance(value, set) else value
+    return config
+
+
+def new_run_id():
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S") + "-" + uuid.uuid4().hex[:6]
+
+
+def open_run():
+    """The run opened by ``runs start``, or None."""
+    if not os.path.exists(OPEN_RUN_FILE):
+        return None
+    with open(OPEN_RUN_FILE, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def start_run(name=None, notes=None):
+    current = open_run()
+    if current:
+        raise RuntimeError(f"Run {current['run_id']} is already open — record or discard it first.")
+    run = {"run_id": new_run_id(), "name": name, "notes": notes,
+           "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+    os.makedirs(RESULTS_FOLDER, exist_ok=True)
+    with open(OPEN_RUN_FILE, "w", encoding="utf-8") as fh:
+        json.dump(run, fh)
+    return run
+
+
+def log_stage(stage, seconds, argv):
+    """Attach one pipeline stage to the open run (called by scripts.cli); no-op without one."""
+    run = open_run()
+    if run is None:
+        return
+    with connect() as conn:
+        conn.execute("INSERT INTO timings (run_id, stage, seconds, argv) VALUES (?, ?, ?, ?)",
+                     (run["run_id"], stage, seconds, json.dumps(argv)))
+
+
+def discard_run():
+    run = open_run()
+    if run is None:
+        return None
+    with connect() as conn:
+        conn.execute("DELETE FROM timings WHERE run_id = ?", (run["run_id"],))
+    os.remove(OPEN_RUN_FILE)
+    return run
+
+
+# --- 2️⃣ Recording ---
+def store_artifact(path):
+    digest = file_sha1(path)
+    ext = os.path.splitext(path)[1]
+    target = os.path.join(ARTIFACT_STORE, digest[:2], digest + ext)
+    if not os.path.exists(target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(path, target)
+    return digest, target
+
+
+def collect_artifacts():
+    rows = []
+    for file in sorted(os.listdir(RESULTS_FOLDER)):
+        for suffix, kind in ARTIFACT_SUFFIXES.items():
+            if file.endswith(suffix) and "_" in file[:-len(suffix)]:
+                stock, model = file[:-len(suffix)].split("_", 1)
+                rows.append((stock, model, kind, os.path.join(RESULTS_FOLDER, file)))
+        if file in RUN_ARTIFACTS:
+            rows.append((None, None, file, os.path.join(RESULTS_FOLDER, file)))
+    # Trained models: models/{stock}_{model}.keras, pooled models have no stock prefix
+    if os.path.isdir(MODELS_FOLDER):
+        for file in sorted(os.listdir(MODELS_FOLDER)):
+            if file.endswith(".keras"):
+                name = file[:-len(".keras")]
+                stock, model = name.split("_", 1) if "_" in name else (None, name)
+                rows.append((stock, model, "model", os.path.join(MODELS_FOLDER, file)))
+    return rows
+
+
+def collect_metrics():
+    import pandas as pd
+
+    summary_path = os.path.join(RESULTS_FOLDER, "var_summary.csv")
+    if not os.path.exists(summary_path):
+        raise FileNotFoundError(f"Missing {summary_path}. Run var_backtest first.")
+    df = pd.read_csv(summary_path)
+    df["CoverageError95"] = (df["ViolRate95"] - 0.05).abs()
+    df["CoverageError99"] = (df["ViolRate99"] - 0.01).abs()
+
+    from scripts.generate_analysis_report import read_mse_files
+    df = df.merge(read_mse_files(), on=["Stock", "Model"], how="left")
+
+    long = df.melt(id_vars=["Stock", "Model"], var_name="metric", value_name="value")
+    long["value"] = pd.to_numeric(long["value"], errors="coerce")
+    return [(r.Stock, r.Model, r.metric, None if pd.isna(r.value) else float(r.value))
+            for r in long.itertuples(index=False)]
+
+
+def record_run(name=None, notes=None):
+    """Snapshot results/ as a run, closing the open run (and its stage timings) if there is one."""
+    run = open_run() or {"run_id": new_run_id()}
+    run_id = run["run_id"]
+    name = name or run.get("name")
+    notes = notes or run.get("notes")
+
+    metrics = collect_metrics()
+    artifacts = [(stock, model, kind, *store_artifact(path))
+                 for stock, model, kind, path in collect_artifacts()]
+
+    with connect() as conn:
+        stages = conn.execute("SELECT stage, argv FROM timings WHERE run_id = ? ORDER BY rowid",
+                              (run_id,)).fetchall()
+        config = {**pipeline_config(),
+                  "stages": [{"stage": stage, "argv": json.loads(argv or "[]")} for stage, argv in stages]}
+        if notes:
+            config["notes"] = notes
+        conn.execute("INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?)", (
+            run_id, name, datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            json.dumps(config, sort_keys=True), data_hash(), code_version(),
+        ))
+        conn.executemany("INSERT INTO metrics VALUES (?, ?, ?, ?, ?)",
+                         [(run_id, *m) for m in metrics])
+        conn.executemany("INSERT INTO artifacts VALUES (?, ?, ?, ?, ?, ?)",
+                         [(run_id, *a) for a in artifacts])
+
+    if os.path.exists(OPEN_RUN_FILE):
+        os.remove(OPEN_RUN_FILE)
+    print(f"✅ Recorded run {run_id}: {len(metrics)} metrics, {len(artifacts)} artifacts, {len(stages)} timed stages")
+    return run_id
+
+
+# --- 3️⃣ Queries ---
+def list_runs(conn, limit=20):
+    import pandas as pd
+    return pd.read_sql_query("""
+        SELECT r.run_id, r.name, r.created_at, r.code_version, substr(r.data_hash, 1, 10) AS data_hash,
+               ROUND(SUM(t.seconds), 1) AS total_s
+        FROM runs r LEFT JOIN timings t USING (run_id)
+        GROUP BY r.run_id ORDER BY r.created_at DESC LIMIT ?
+    """, conn, params=(limit,))
+
+
+def best_model(conn, stock, metric="CoverageError95", last=30, descending=False):
+    import pandas as pd
+    order = "DESC" if descending else "ASC"
+    return pd.read_sql_query(f"""
+        SELECT m.run_id, r.created_at, m.model, m.value
+        FROM metrics m JOIN runs r USING (run_id)
+        WHERE m.stock = ? AND m.metric = ? AND m.value IS NOT NULL
+          AND m.run_id IN (SELECT run_id FROM runs ORDER BY created_at DESC LIMIT ?)
+        ORDER BY m.value {order} LIMIT 10
+    """, conn, params=(stock, metric, last))
+
+
+def diff_runs(conn, run_a, run_b):
+    import pandas as pd
+    runs = pd.read_sql_query("SELECT * FROM runs WHERE run_id IN (?, ?)", conn,
+                             params=(run_a, run_b)).set_index("run_id")
+    missing = [r for r in (run_a, run_b) if r not in runs.index]
+    if missing:
+        raise ValueError(f"Unknown run id(s): {', '.join(missing)} — see `runs list`.")
+    metrics = pd.read_sql_query("""
+        SELECT a.stock, a.model, a.metric, a.value AS value_a, b.value AS value_b, b.value - a.value AS delta
+        FROM metrics a JOIN metrics b
+          ON a.stock = b.stock AND a.model = b.model AND a.metric = b.metric
+        WHERE a.run_id = ? AND b.run_id = ? AND a.value IS NOT b.value
+        ORDER BY a.stock, a.model, a.metric
+    """, conn, params=(run_a, run_b))
+
+    config_a, config_b = (json.loads(runs.loc[r, "config"]) for r in (run_a, run_b))
+    config_diff = {k: (config_a.get(k), config_b.get(k))
+                   for k in sorted(set(config_a) | set(config_b)) if config_a.get(k) != config_b.get(k)}
+    for col in ("data_hash", "code_version"):
+        if runs.loc[run_a, col] != runs.loc[run_b, col]:
+            config_diff[col] = (runs.loc[run_a, col], runs.loc[run_b, col])
+    return config_diff, metrics
+
+
+def run_summary(conn, run_id):
+    """A run's metrics pivoted back into the ``var_summary.csv`` layout."""
+    import pandas as pd
+    long = pd.read_sql_query("SELECT stock, model, metric, value FROM metrics WHERE run_id = ?",
+                             conn, params=(run_id,))
+    wide = long.pivot_table(index=["stock", "model"], columns="metric", values="value", dropna=False)
+    wide.columns.name = None
+    return wide.reset_index().rename(columns={"stock": "Stock", "model": "Model"})
+
+
+def artifact_path(conn, run_id, stock, model, kind):
+    row = conn.execute("SELECT path FROM artifacts WHERE run_id = ? AND stock IS ? AND model IS ? AND kind = ?",
+                       (run_id, stock, model, kind)).fetchone()
+    return row[0] if row else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Experiment run registry.")
+    sub = parser.add_subparsers(dest="action", required=True)
+    start = sub.add_parser("start", help="open a run; CLI stage timings attach to it until it is recorded")
+    start.add_argument("--name")
+    start.add_argument("--notes")
+    sub.add_parser("discard", help="drop the open run and its timings")
+    rec = sub.add_parser("record", help="snapshot the current results/ as a run (closes the open run)")
+    rec.add_argument("--name")
+    rec.add_argument("--notes")
+    lst = sub.add_parser("list", help="most recent runs")
+    lst.add_argument("--limit", type=int, default=20)
+    best = sub.add_parser("best", help="best model for a stock over recent runs")
+    best.add_argument("stock")
+    best.add_argument("--metric", default="CoverageError95")
+    best.add_argument("--last", type=int, default=30)
+    best.add_argument("--desc", action="store_true", help="higher is better (e.g. Kupiec_p95)")
+    diff = sub.add_parser("diff", help="config and metric differences between two runs")
+    diff.add_argument("run_a")
+    diff.add_argument("run_b")
+    args = parser.parse_args()
+
+    if args.action == "start":
+        try:
+            run = start_run(args.name, args.notes)
+        except RuntimeError as exc:
+            print(f"❌ {exc}")
+            return 1
+        print(f"🚀 Opened run {run['run_id']} — CLI stages are now timed into it.")
+        return 0
+    if args.action == "discard":
+        run = discard_run()
+        print(f"🗑️ Discarded run {run['run_id']}." if run else "⚠️ No open run.")
+        return 0
+    if args.action == "record":
+        try:
+            record_run(args.name, args.notes)
+        except FileNotFoundError as exc:
+            print(f"❌ {exc}")
+            return 1
+        return 0
+
+    import pandas as pd
+    pd.set_option("display.width", 160)
+    with connect() as conn:
+        if args.action == "list":
+            print(list_runs(conn, args.limit).to_string(index=False))
+        elif args.action == "best":
+            print(best_model(conn, args.stock, args.metric, args.last, args.desc).to_string(index=False))
+        elif args.action == "diff":
+            try:
+                config_diff, metrics = diff_runs(conn, args.run_a, args.run_b)
+            except ValueError as exc:
+                print(f"❌ {exc}")
+                return 1
+            print("Config / provenance changes:")
+            for key, (a, b) in config_diff.items():
+                print(f"  {key}: {a} → {b}")
+            print(f"\nMetric changes ({len(metrics)}):")
+            print(metrics.to_string(index=False))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+import tensorflow as tf
+
+from scripts.preprocess_data import DATA_FOLDER as RAW_DATA_FOLDER, OUTPUT_FOLDER, WINDOW_SIZE
+from scripts.train_models import MODELS_FOLDER, RESULTS_FOLDER, MODEL_BUILDERS
+from scripts.var_backtest import SUMMARY_FILE
+
+STRESS_RESULTS = os.path.join(RESULTS_FOLDER, "stress_results.csv")
+STRESS_SUMMARY = os.path.join(RESULTS_FOLDER, "stress_summary.csv")
+
+# --- Scenario library ---
+# Historical: every 30-day window ending inside each crisis period becomes one scenario
+HISTORICAL_PERIODS = {
+    "GFC2008": ("2008-09-01", "2009-03-31"),
+    "EuroDebt2011": ("2011-07-25", "2011-10-31"),
+    "China2015": ("2015-08-10", "2015-09-30"),
+    "Volmageddon2018": ("2018-01-29", "2018-02-28"),
+    "COVID2020": ("2020-02-19", "2020-04-30"),
+}
+# Hypothetical: shocks applied to each ticker's most recent window
+VOL_SCALES = [1.0, 1.5, 2.0, 3.0, 5.0]
+GAP_MOVES = [0.0, -0.05, -0.10, -0.20]
+
+
+def load_returns(stock):
+    df = pd.read_csv(os.path.join(RAW_DATA_FOLDER, f"{stock}_data.csv"),
+                     skiprows=[1, 2], index_col=0, parse_dates=True)
+    return pd.to_numeric(df["LogReturn"], errors="coerce").dropna()
+
+
+def historical_scenarios(returns):
+    windows = sliding_window_view(returns.to_numpy(), WINDOW_SIZE)
+    end_dates = returns.index[WINDOW_SIZE - 1:]
+    names, batches = [], []
+    for period, (start, end) in HISTORICAL_PERIODS.items():
+        mask = (end_dates >= start) & (end_dates <= end)
+        if not mask.any():
+            continue
+        names.extend(f"{period}@{d:%Y-%m-%d}" for d in end_dates[mask])
+        batches.append(windows[mask])
+    return names, batches
+
+
+def hypothetical_scenarios(returns):
+    recent = returns.to_numpy()[-WINDOW_SIZE:]
+    centre = recent.mean()
+    scales = np.array(VOL_SCALES)[:, None, None]
+    gaps = np.log1p(np.array(GAP_MOVES))[None, :, None]
+
+    # Grid of (vol scale × gap): scale deviations around the mean, then gap the last day
+    shape = (len(VOL_SCALES), len(GAP_MOVES), WINDOW_SIZE)
+    shocked = np.broadcast_to(centre + scales * (recent - centre), shape).copy()
+    shocked[:, :, -1:] += gaps
+    names = [f"Vol×{s:g}|Gap{g:+.0%}" for s in VOL_SCALES for g in GAP_MOVES]
+    return names, [shocked.reshape(-1, WINDOW_SIZE)]
+
+
+def build_scenarios(stock):
+    """Return scenario names and raw-return windows of shape ``(scenarios, WINDOW_SIZE)``."""
+    returns = load_returns(stock)
+    hist_names, hist = historical_scenarios(returns)
+    hyp_names, hyp = hypothetical_scenarios(returns)
+    windows = np.concatenate(hist + hyp)
+    kinds = ["Historical"] * len(hist_names) + ["Hypothetical"] * len(hyp_names)
+    # Same standardisation the models were trained with
+    processed = np.load(os.path.join(OUTPUT_FOLDER, f"{stock}_seq.npz"))
+    if "scaler_mean" in processed:
+        mean, std = float(processed["scaler_mean"][0]), float(processed["scaler_scale"][0])
+    else:
+        mean, std = returns.mean(), returns.std(ddof=0)
+    return hist_names + hyp_names, kinds, windows, mean, std
+
+
+def run_stress(stocks, models):
+    frames = []
+    for stock in stocks:
+        names, kinds, windows, mean, std = build_scenarios(stock)
+        batch = ((windows - mean) / std)[..., np.newaxis].astype(np.float32)
+        for model_name in models:
+            path = f"{MODELS_FOLDER}/{stock}_{model_name}.keras"
+            if not os.path.exists(path):
+                continue
+            model = tf.keras.models.load_model(path)
+
+            # One batched inference over every scenario for this stock/model
+            start = time.perf_counter()
+            preds = model.predict(batch, batch_size=4096, verbose=0).flatten()
+            elapsed = time.perf_counter() - start
+
+            frames.append(pd.DataFrame({
+                "Stock": stock,
+                "Model": model_name,
+                "Scenario": names,
+                "Kind": kinds,
+                "WindowReturn": windows.sum(axis=1),
+                "PredScaled": preds,
+                "PredReturn": preds * std + mean,
+            }))
+            print(f"✅ {stock}-{model_name}: {len(names)} scenarios in {elapsed:.3f}s")
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def summarise(results):
+    # Breach flags are in the same scaled units as var_summary.csv
+    if os.path.exists(SUMMARY_FILE):
+        var = pd.read_csv(SUMMARY_FILE)[["Stock", "Model", "VaR95", "VaR99"]]
+        results = results.merge(var, on=["Stock", "Model"], how="left")
+        results["BelowVaR95"] = results["PredScaled"] < results["VaR95"]
+        results["BelowVaR99"] = results["PredScaled"] < results["VaR99"]
+
+    grouped = results.groupby(["Stock", "Model", "Kind"])
+    summary = grouped.agg(
+        Scenarios=("Scenario", "size"),
+        MeanPredReturn=("PredReturn", "mean"),
+        MinPredReturn=("PredReturn", "min"),
+    )
+    summary["WorstScenario"] = results.loc[grouped["PredReturn"].idxmin(), "Scenario"].to_numpy()
+    if "BelowVaR95" in results:
+        summary["PctBelowVaR95"] = grouped["BelowVaR95"].mean()
+        summary["PctBelowVaR99"] = grouped["BelowVaR99"].mean()
+    return results, summary.reset_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched historical and hypothetical stress tests.")
+    parser.add_argument("--stocks", nargs="*", help="default: every raw dataset")
+    parser.add_argument("--models", nargs="*", default=list(MODEL_BUILDERS))
+    args = parser.parse_args()
+
+    stocks = args.stocks or sorted(
+        f.replace("_data.csv", "") for f in os.listdir(RAW_DATA_FOLDER) if f.endswith("_data.csv")
+    )
+
+    results = run_stress(stocks, args.models)
+    if results.empty:
+        print("⚠️ No trained models found — run train_models.py first.")
+        return
+    results, summary = summarise(results)
+    results.to_csv(STRESS_RESULTS, index=False)
+    summary.to_csv(STRESS_SUMMARY, index=False)
+
+    print(f"\n✅ Stress results saved to {STRESS_RESULTS}")
+    print(f"✅ Stress summary saved to {STRESS_SUMMARY}")
+    print(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+import os
+import pandas as pd
+
+# One row per stock: display name, exchange ticker, market grouping
+TICKERS_FILE = os.path.join("data", "tickers.csv")
+
+
+def load_tickers(path=TICKERS_FILE):
+    return pd.read_csv(path)
+
+
+def add_market(df, tickers=None):
+    # Stocks missing from the metadata table are grouped under "Other"
+    tickers = load_tickers() if tickers is None else tickers
+    market = tickers.set_index("Stock")["Market"]
+    return df.assign(Market=df["Stock"].map(market).fillna("Other"))
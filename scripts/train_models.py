@@ -1,15 +1,18 @@
+import argparse
 import numpy as np
 import os
 from sklearn.metrics import mean_squared_error
-from scripts.models import build_mlp, build_cnn, build_lstm, build_transformer
-import tensorflow as tf
+from scripts.models import (
+    build_mlp, build_cnn, build_lstm, build_transformer, build_student_mlp, build_student_cnn
+)
 import tensorflow as tf
 from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
+from scripts.preprocess_data import TEST_SPLIT
 
 # Folder paths
 DATA_FOLDER = "data/processed"
 RESULTS_FOLDER = "results"
-os.makedirs(RESULTS_FOLDER, exist_ok=True)
+MODELS_FOLDER = "models"
 
 EPOCHS = 40
 BATCH_SIZE = 64
@@ -19,25 +22,33 @@ callbacks = [
     ReduceLROnPlateau(monitor='val_loss', factor=0.5, patience=3)
 ]
 
-TEST_SPLIT = 0.8
-
 # Model builders dictionary
 MODEL_BUILDERS = {
     "MLP": build_mlp,
     "CNN1D": build_cnn,
     "LSTM": build_lstm,
-    "Transformer": build_transformer
+    "Transformer": build_transformer,
+    "StudentMLP": build_student_mlp,
+    "StudentCNN": build_student_cnn
 }
 
-# Loop through each processed dataset
-for file in os.listdir(DATA_FOLDER):
-    if not file.endswith(".npz"):
-        continue
+# Students are fitted on a teacher's predictions by distill.py, not on raw returns
+STUDENT_MODELS = {"StudentMLP", "StudentCNN"}
+
+
+def configure_threads(threads):
+    """Pin TF thread pools; only possible before the TF runtime starts (first op / model)."""
+    if threads:
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(2)
 
-    stock_name = file.replace("_seq.npz", "")
-    print(f"\n📈 Training models for {stock_name}...")
 
-    # Load data
+def list_stocks():
+    """Names of every processed dataset (``{stock}_seq.npz`` in DATA_FOLDER), sorted."""
+    return sorted(f[:-len("_seq.npz")] for f in os.listdir(DATA_FOLDER) if f.endswith("_seq.npz"))
+
+
+def load_dataset(file):
     data = np.load(os.path.join(DATA_FOLDER, file))
     X, y = data["X"], data["y"]
 
@@ -45,31 +56,67 @@ for file in os.listdir(DATA_FOLDER):
     split_idx = int(TEST_SPLIT * len(X))
     X_train, X_test = X[:split_idx], X[split_idx:]
     y_train, y_test = y[:split_idx], y[split_idx:]
-
-    input_shape = (X_train.shape[1], X_train.shape[2])
-
-    for model_name, builder in MODEL_BUILDERS.items():
-        print(f"\n🚀 Training {model_name} model...")
-        model = builder(input_shape)
-
-        history = model.fit(
-            X_train, y_train,
-            epochs=EPOCHS,
-            batch_size=BATCH_SIZE,
-            validation_split=0.1,
-            callbacks=callbacks,
-            verbose=1
-        )
-
-        preds = model.predict(X_test)
-        mse = mean_squared_error(y_test, preds)
-
-        # Save results
-        np.savez_compressed(f"{RESULTS_FOLDER}/{stock_name}_{model_name}_preds.npz",
-                            y_test=y_test, preds=preds)
-        with open(f"{RESULTS_FOLDER}/{stock_name}_{model_name}_mse.txt", "w") as f:
-            f.write(f"MSE: {mse}\n")
-
-        print(f"✅ {model_name} done. MSE = {mse:.6f}")
-
-print("\n🎯 All models trained and predictions saved!")
+    return X_train, X_test, y_train, y_test
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train every architecture on each processed dataset.")
+    parser.add_argument("--fast", action="store_true",
+                        help="XLA train steps, bf16 where supported, scaled batch/LR (see training_perf.py)")
+    parser.add_argument("--bf16", choices=["auto", "on", "off"], default="auto")
+    parser.add_argument("--threads", type=int, help="intra-op threads")
+    args = parser.parse_args()
+
+    configure_threads(args.threads)
+    if args.fast:
+        from scripts.training_perf import configure_fast_mode, build_fast
+        settings = configure_fast_mode(args.bf16)
+        print(f"⚡ Fast training mode: bf16={settings['bf16']} (per-architecture XLA/bf16 in FAST_SETTINGS)")
+
+    os.makedirs(RESULTS_FOLDER, exist_ok=True)
+    os.makedirs(MODELS_FOLDER, exist_ok=True)
+
+    # Loop through each processed dataset
+    for stock_name in list_stocks():
+        print(f"\n📈 Training models for {stock_name}...")
+
+        # Load data
+        X_train, X_test, y_train, y_test = load_dataset(f"{stock_name}_seq.npz")
+
+        input_shape = (X_train.shape[1], X_train.shape[2])
+
+        for model_name, builder in MODEL_BUILDERS.items():
+            if model_name in STUDENT_MODELS:
+                continue
+            print(f"\n🚀 Training {model_name} model...")
+            if args.fast:
+                model, batch_size, extra = build_fast(model_name, input_shape, len(X_train), settings["bf16"])
+            else:
+                model, batch_size, extra = builder(input_shape), BATCH_SIZE, []
+
+            history = model.fit(
+                X_train, y_train,
+                epochs=EPOCHS,
+                batch_size=batch_size,
+                validation_split=0.1,
+                callbacks=callbacks + extra,
+                verbose=1
+            )
+
+            preds = model.predict(X_test)
+            mse = mean_squared_error(y_test, preds)
+
+            # Save results
+            model.save(f"{MODELS_FOLDER}/{stock_name}_{model_name}.keras")
+            np.savez_compressed(f"{RESULTS_FOLDER}/{stock_name}_{model_name}_preds.npz",
+                                y_test=y_test, preds=preds)
+            with open(f"{RESULTS_FOLDER}/{stock_name}_{model_name}_mse.txt", "w") as f:
+                f.write(f"MSE: {mse}\n")
+
+            print(f"✅ {model_name} done. MSE = {mse:.6f}")
+
+    print("\n🎯 All models trained and predictions saved!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+
+from scripts.train_models import (
+    RESULTS_FOLDER, MODEL_BUILDERS, STUDENT_MODELS, EPOCHS, BATCH_SIZE,
+    configure_threads, list_stocks, load_dataset
+)
+from scripts.var_backtest import var_metrics
+
+PERF_REPORT = os.path.join(RESULTS_FOLDER, "training_perf.csv")
+
+MIN_STEPS_PER_EPOCH = 20    # batch grows only while each epoch keeps at least this many steps
+MAX_BATCH_FACTOR = 8
+WARMUP_EPOCHS = 3           # linear LR warm-up after scaling the batch
+VALIDATION_SPLIT = 0.1      # fraction of the training windows Keras holds out in fit()
+
+# Per-architecture fast-mode switches, kept only where train-bench shows a gain.
+# XLA + an unrolled BiLSTM made the first LSTM epoch ~25x and later epochs ~3x
+# slower than the default path, so the LSTM only gets batch/LR scaling.
+DEFAULT_FAST = {"jit_compile": True, "bf16": True}
+FAST_SETTINGS = {
+    "LSTM": {"jit_compile": False, "bf16": False},
+}
+
+
+# --- 1️⃣ Hardware / precision setup ---
+def cpu_supports_bf16():
+    try:
+        with open("/proc/cpuinfo") as fh:
+            flags = fh.read()
+    except OSError:
+        return False
+    return "avx512_bf16" in flags or "amx_bf16" in flags
+
+
+def configure_fast_mode(bf16="auto"):
+    """Resolve process-wide fast-mode settings; the precision policy is applied per model."""
+    use_bf16 = bf16 == "on" or (bf16 == "auto" and cpu_supports_bf16())
+    return {"bf16": use_bf16}
+
+
+# --- 2️⃣ Batch-size / learning-rate scaling ---
+def batch_factor(n_train, base_batch=BATCH_SIZE):
+    # Largest power of two that keeps MIN_STEPS_PER_EPOCH optimizer steps per epoch
+    n_fit = int(n_train * (1 - VALIDATION_SPLIT))
+    factor = 1
+    while (factor * 2 <= MAX_BATCH_FACTOR
+           and n_fit // (base_batch * factor * 2) >= MIN_STEPS_PER_EPOCH):
+        factor *= 2
+    return factor
+
+
+class LinearWarmup(tf.keras.callbacks.Callback):
+    """Ramp the learning rate up to ``target_lr`` over the first epochs, then leave it alone."""
+
+    def __init__(self, target_lr, warmup_epochs=WARMUP_EPOCHS):
+        super().__init__()
+        self.target_lr = target_lr
+        self.warmup_epochs = warmup_epochs
+
+    def on_epoch_begin(self, epoch, logs=None):
+        if epoch < self.warmup_epochs:
+            self.model.optimizer.learning_rate.assign(self.target_lr * (epoch + 1) / self.warmup_epochs)
+
+
+def build_fast(model_name, input_shape, n_train, bf16=False):
+    """Build a registry model compiled for fast CPU training; returns (model, batch_size, callbacks)."""
+    settings = FAST_SETTINGS.get(model_name, DEFAULT_FAST)
+    use_bf16 = bf16 and settings["bf16"]
+    tf.keras.mixed_precision.set_global_policy("mixed_bfloat16" if use_bf16 else "float32")
+    model = MODEL_BUILDERS[model_name](input_shape)
+    factor = batch_factor(n_train)
+    # Linear scaling rule on the builder's own learning rate
+    target_lr = float(model.optimizer.learning_rate.numpy()) * factor
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=target_lr), loss='mse',
+                  jit_compile=settings["jit_compile"])
+    extra = [LinearWarmup(target_lr)] if factor > 1 else []
+    return model, BATCH_SIZE * factor, extra
+
+
+# --- 3️⃣ Per-architecture epoch-time / validation-loss report ---
+class EpochTimer(tf.keras.callbacks.Callback):
+    def on_train_begin(self, logs=None):
+        self.times = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._start = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.times.append(time.perf_counter() - self._start)
+
+
+def fit_and_measure(model, X_train, y_train, X_test, y_test, batch_size, epochs, extra_callbacks=()):
+    timer = EpochTimer()
+    start = time.perf_counter()
+    history = model.fit(
+        X_train, y_train,
+        epochs=epochs,
+        batch_size=batch_size,
+        validation_split=VALIDATION_SPLIT,
+        callbacks=[
+            timer,
+            *extra_callbacks,
+            tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=6, restore_best_weights=True),
+            tf.keras.callbacks.ReduceLROnPlateau(monitor='val_loss', factor=0.5, patience=3),
+        ],
+        verbose=0
+    )
+    wall = time.perf_counter() - start
+    metrics = var_metrics(y_test, model.predict(X_test, verbose=0))
+    # First epoch includes tracing / XLA compilation, so report the steady-state median too
+    return {
+        "BatchSize": batch_size,
+        "Epochs": len(timer.times),
+        "FirstEpoch_s": timer.times[0],
+        "MedianEpoch_s": float(np.median(timer.times[1:] or timer.times)),
+        "Wall_s": wall,
+        "BestValLoss": float(np.min(history.history["val_loss"])),
+        "ViolRate95": metrics["ViolRate95"],
+        "ViolRate99": metrics["ViolRate99"],
+    }
+
+
+def main():
+    teachers = [m for m in MODEL_BUILDERS if m not in STUDENT_MODELS]
+    parser = argparse.ArgumentParser(description="Compare default vs fast CPU training per architecture.")
+    parser.add_argument("--stock", help="dataset to benchmark on (default: first processed dataset)")
+    parser.add_argument("--models", nargs="*", default=teachers, choices=list(MODEL_BUILDERS))
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--bf16", choices=["auto", "on", "off"], default="auto")
+    parser.add_argument("--threads", type=int)
+    args = parser.parse_args()
+
+    # Thread pools are fixed once TF starts, so set them before the first (default) fit
+    configure_threads(args.threads)
+    settings = configure_fast_mode(args.bf16)
+    stock = args.stock or list_stocks()[0]
+    X_train, X_test, y_train, y_test = load_dataset(f"{stock}_seq.npz")
+    input_shape = (X_train.shape[1], X_train.shape[2])
+
+    rows = []
+    for model_name in args.models:
+        print(f"\n⏱️ {stock}-{model_name}: default training...")
+        tf.keras.mixed_precision.set_global_policy("float32")
+        tf.keras.utils.set_random_seed(42)
+        model = MODEL_BUILDERS[model_name](input_shape)
+        base = fit_and_measure(model, X_train, y_train, X_test, y_test, BATCH_SIZE, args.epochs)
+
+        print(f"⚡ {stock}-{model_name}: fast training...")
+        tf.keras.utils.set_random_seed(42)
+        model, batch_size, extra = build_fast(model_name, input_shape, len(X_train), settings["bf16"])
+        fast = fit_and_measure(model, X_train, y_train, X_test, y_test, batch_size, args.epochs, extra)
+
+        for mode, res in (("default", base), ("fast", fast)):
+            rows.append({"Stock": stock, "Model": model_name, "Mode": mode,
+                         "bf16": mode == "fast" and settings["bf16"] and
+                                 FAST_SETTINGS.get(model_name, DEFAULT_FAST)["bf16"],
+                         "XLA": mode == "fast" and FAST_SETTINGS.get(model_name, DEFAULT_FAST)["jit_compile"],
+                         **res})
+        print(f"✅ {model_name}: median epoch {base['MedianEpoch_s']:.2f}s → {fast['MedianEpoch_s']:.2f}s, "
+              f"ΔViolRate95={fast['ViolRate95'] - base['ViolRate95']:+.4f}")
+
+    df = pd.DataFrame(rows)
+    df.to_csv(PERF_REPORT, index=False)
+    print(f"\n✅ Training performance report saved to {PERF_REPORT}")
+    print(df)
+
+
+if __name__ == "__main__":
+    main()
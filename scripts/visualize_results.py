@@ -113,7 +113,7 @@ def summary_visuals_per_stock(df):
 
 
 # --- MAIN EXECUTION ---
-if __name__ == "__main__":
+def main():
     df = pd.read_csv(SUMMARY_FILE)
 
     # Plot VaR lines for each stock-model
@@ -126,3 +126,7 @@ if __name__ == "__main__":
     summary_visuals_per_stock(df)
 
     print("\n🎨 All visualizations generated successfully!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+pytest.importorskip("scipy")
+pytest.importorskip("sklearn")
+
+from scripts.cross_validate import SCHEMES, fold_arrays, make_folds
+from scripts.preprocess_data import WINDOW_SIZE
+
+N = 1000
+K = 5
+EMBARGO = 0.02
+
+
+def spans(idx):
+    # Sample i reads returns[i : i + WINDOW_SIZE] and predicts returns[i + WINDOW_SIZE]
+    return idx, idx + WINDOW_SIZE
+
+
+@pytest.mark.parametrize("scheme", SCHEMES)
+def test_train_windows_never_touch_test_windows(scheme):
+    for train, test in make_folds(N, K, scheme, embargo=EMBARGO):
+        assert len(train) and len(test)
+        train_lo, train_hi = spans(train)
+        test_lo, test_hi = spans(test)
+        # Closed intervals [lo, hi] of return indices must be disjoint
+        overlap = (train_lo[:, None] <= test_hi[None]) & (test_lo[None] <= train_hi[:, None])
+        assert not overlap.any()
+
+
+@pytest.mark.parametrize("scheme", SCHEMES)
+def test_embargo_gap_after_each_test_block(scheme):
+    embargo_n = int(EMBARGO * N)
+    for train, test in make_folds(N, K, scheme, embargo=EMBARGO):
+        after = train[train > test[-1]]
+        if scheme == "expanding":
+            # Walk-forward never trains on data after the test block
+            assert len(after) == 0
+        elif len(after):
+            assert after.min() - test[-1] > WINDOW_SIZE + embargo_n
+        before = train[train < test[0]]
+        if len(before):
+            assert test[0] - before.max() > WINDOW_SIZE
+
+
+def test_fold_scaler_uses_training_targets_only():
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0, 0.01, N + WINDOW_SIZE)
+    train, test = make_folds(N, K, "purged")[2]
+    X_train, y_train, X_test, y_test = fold_arrays(returns, train, test)
+
+    targets = returns[train + WINDOW_SIZE]
+    mean, std = targets.mean(), targets.std()
+    np.testing.assert_allclose(y_train.ravel(), (targets - mean) / std, rtol=0, atol=1e-5)
+    np.testing.assert_allclose(y_test.ravel(), (returns[test + WINDOW_SIZE] - mean) / std,
+                               rtol=0, atol=1e-5)
+    np.testing.assert_allclose(X_test[0, :, 0], (returns[test[0]:test[0] + WINDOW_SIZE] - mean) / std,
+                               rtol=0, atol=1e-5)
+
+    # Shocking the test span must not move the scaling of the training windows
+    shocked = returns.copy()
+    shocked[test + WINDOW_SIZE] *= 50
+    np.testing.assert_allclose(fold_arrays(shocked, train, test)[1], y_train)
@@ -0,0 +1,17 @@
+import pytest
+
+from scripts.cli import STARTUP_BUDGET, measure_startup
+
+# The measured commands import these at module level
+pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+pytest.importorskip("scipy")
+
+
+@pytest.mark.parametrize("command", sorted(STARTUP_BUDGET))
+def test_startup_within_budget(command):
+    elapsed, error = measure_startup(command)
+    assert error is None, f"{command} failed to load: {error}"
+    assert elapsed <= STARTUP_BUDGET[command], (
+        f"{command} cold start {elapsed:.3f}s exceeds budget {STARTUP_BUDGET[command]:.2f}s"
+    )